@@ -3,6 +3,8 @@ import bs4
 from dataclasses import dataclass, field
 from enum import Enum
 import collections
+import concurrent.futures
+import contextlib
 import itertools
 import argparse
 import csv
@@ -14,6 +16,7 @@ import termios
 import threading
 import time
 import logging
+import operator
 import re
 import urllib.request
 
@@ -21,18 +24,33 @@ import texteditor  # type: ignore[import-untyped]
 import textwrap
 import math
 import getpass
+import heapq
 from fzf import Fzf, fzf  # type: ignore[import-untyped]
 
 from functools import cache
 from thefuzz import process, fuzz  # type: ignore[import-untyped]
+import numpy as np
 from rich import print
-from rich.progress import track
+from rich.progress import track as rich_track
 from rich.highlighter import Highlighter
 from rich.panel import Panel
 from rich.table import Table
 from rich.console import Console
 
-from typing import Any, TypeVar, Callable, Sequence
+from typing import Any, TypeVar, Callable, Iterator, Sequence
+
+from players import (
+    DETACHED_TABLE,
+    EXTERNAL_IDS,
+    PROFILE_FILE,
+    PlayerTable,
+    StartupProfile,
+    column,
+    count_load,
+    counted,
+    fantasy_team_column,
+    normalize_name,
+)
 
 T = TypeVar("T")
 
@@ -97,6 +115,11 @@ OSB_ROS_FILE = "data/one-street-bowl-ros-rankings.csv"
 # QBs and start 1 each week. Current rosters are considered, so if you've
 # already drafted 2 wide receivers, only combos containing them are considered.
 #
+# Combos are per position, so they can't see FLEX or SUPERFLEX spots. LINEUP is
+# your starting lineup, e.g. {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1,
+# "SF": 1}, and the analyzer also ranks who adds the most to your roster's best
+# lineup each week. It defaults to the starters in DRAFT_SETTINGS.
+#
 # Finally, if a --max-age is specified or MAX_AGE is set below, players over
 # that age will not be included in Combos. Who wants a 32 year old WR4?
 #
@@ -111,7 +134,19 @@ PERCENTAGE_POINTS_VAR = 0.3
 NUM_RECOMMEND = 4
 COMBOS_MAX_WEEK = 13
 COMBOS_NUM_GAMES = 10
+# How many of the best combos to keep, see --top-combos
+COMBOS_TOP_K = 500
+# Processes to spread slow combo searches over, and how many seconds a search
+# runs alone before it does, so quick ones don't pay to start them
+COMBOS_WORKERS = os.cpu_count() or 1
+COMBOS_SERIAL_SECONDS = 0.5
 DRAFT_SETTINGS = {}
+LINEUP: dict[str, int] = {}
+# Positions each flex lineup slot can be filled from
+FLEX_POSITIONS = {
+    "FLEX": frozenset(["RB", "WR", "TE"]),
+    "SF": frozenset(["QB", "RB", "WR", "TE"]),
+}
 MAX_AGE = 100
 
 OVERALL_TIER = "Overall"
@@ -131,6 +166,12 @@ ROSTERS_FILE = ""
 USERS_FILE = ""
 
 
+def track(sequence: Any, description: str = "Working...", total: float | None = None) -> Any:
+    if total is None:
+        total = operator.length_hint(sequence) or None
+    return rich_track(counted(sequence), description=description, total=total)
+
+
 def load_config(config_name) -> None:
     global CONFIG
     try:
@@ -156,7 +197,7 @@ def load_config(config_name) -> None:
                 raise RuntimeError(f"Missing required config '{s}'")
         return default_fn()
 
-    global STATE_FILE, LEAGUE_ID, MY_USER_ID, DRAFT_ID, KEEPERS_FILE, PICKS_FILE, DRAFT_FILE, ROSTERS_FILE, USERS_FILE, DRAFT_SETTINGS, DRAFT_VALUE_FILE, DRAFT_VALUE_FILE_GEN
+    global STATE_FILE, LEAGUE_ID, MY_USER_ID, DRAFT_ID, KEEPERS_FILE, PICKS_FILE, DRAFT_FILE, ROSTERS_FILE, USERS_FILE, DRAFT_SETTINGS, LINEUP, DRAFT_VALUE_FILE, DRAFT_VALUE_FILE_GEN
 
     STATE_FILE = get("STATE_FILE", required=False)
     if not STATE_FILE:
@@ -181,6 +222,9 @@ def load_config(config_name) -> None:
     draft_settings = get("DRAFT_SETTINGS", default_fn=dict, required=False)
     if draft_settings:
         DRAFT_SETTINGS = draft_settings
+    LINEUP = get("LINEUP", default_fn=dict, required=False) or {
+        pos: conf[0] for pos, conf in DRAFT_SETTINGS.items()
+    }
 
 
 class Matchup:
@@ -216,16 +260,6 @@ class Team:
         return f"[bold #{self.color}]{self.long_name}[/bold #{self.color}]"
 
 
-class WeekFPPGs(collections.UserList[float]):
-    def __init__(self, obj: Any | None = None) -> None:
-        super().__init__(obj if obj else list())
-        for _ in range(18):
-            self.append(0.0)
-
-    def __str__(self) -> str:
-        return ", ".join("%.2f" % f for f in self)
-
-
 class PlayerName(str):
     @property
     def unf(self) -> str:
@@ -240,33 +274,22 @@ class Player:
     name: PlayerName
     team_name: str
     position: str
-    rank: int
-    positional_rank: int
     score = 0.0
     fppg = 0.0
-    age = 0
     height = 0
     weight = 0
     experience = None
     number = 0
     status = "UNK"
     sleeper_id = ""
-    projection = 0.0
-    keeper_cost = 0
-    draft_value = 0
     actual_cost = 0
     actual_draft_pos: int | None = None
-    fantasy_team: "FantasyTeam | None" = None
     is_override = False
 
     depth_chart_position = "UN"
     depth_chart_order = 100
 
-    adp = 1000.0
-    overall_tier = 15
-    pos_tier = 15
     is_keeper = False
-    sleeper_auction_value = 0.0
     ds_note: str | None = None
 
     team: Team | None = None
@@ -275,10 +298,8 @@ class Player:
     career_injuries = 0
     injury_risk_per_season = 0.0
     durability = 0.0
-    projected_games_missed = 0.0
 
     weeks: list[Matchup] = field(default_factory=list)
-    week_fppgs: WeekFPPGs = field(default_factory=WeekFPPGs)
 
     routes_run = 0
     first_downs_per_route_run = 0.0
@@ -304,13 +325,36 @@ class Player:
     injury_notes = ""
     college = ""
 
+    table: PlayerTable = field(default=DETACHED_TABLE, repr=False, compare=False)
+    row: int = field(default=-1, init=False, repr=False, compare=False)
+
+    projection = column("projection")
+    adp = column("adp")
+    overall_tier = column("overall_tier")
+    pos_tier = column("pos_tier")
+    draft_value = column("draft_value")
+    sleeper_auction_value = column("sleeper_auction_value")
+    keeper_cost = column("keeper_cost")
+    age = column("age")
+    rank = column("rank")
+    positional_rank = column("positional_rank")
+    projected_games_missed = column("projected_games_missed")
+    fantasy_team = fantasy_team_column()
+
+    def __post_init__(self) -> None:
+        self.row = self.table.append(self)
+
     def __hash__(self) -> int:
         return hash(self.sleeper_id)
 
+    @property
+    def week_fppgs(self) -> np.ndarray:
+        return self.table.columns["week_fppgs"][self.row]
+
     def week_fppg(self, i: int) -> float:
         if i >= len(self.weeks):
             return 0.0
-        return self.week_fppgs[i]
+        return self.table.columns["week_fppgs"].item(self.row, i)
 
     def adj_projection(self) -> float:
         return self.projection * (17 - self.projected_games_missed) / 17
@@ -318,20 +362,6 @@ class Player:
     def name_str(self) -> str:
         return f"[bold blue]{self.name}[/bold blue]"
 
-    def calc_score(self) -> None:
-        stars = 0
-        proj = self.adj_projection()
-        for i in range(len(self.weeks)):
-            stars += self.weeks[i].favor
-        vari = proj * PERCENTAGE_POINTS_VAR
-        fixed = (proj - vari) / (len(self.weeks) - 1)
-        points_per_star = vari / stars
-        for i in range(len(self.weeks)):
-            if self.weeks[i].favor == 0:
-                self.week_fppgs[i] = 0
-            else:
-                self.week_fppgs[i] = fixed + points_per_star * self.weeks[i].favor
-
     @property
     def picked(self) -> bool:
         return self.fantasy_team is not None and self.fantasy_team.id == MY_USER_ID
@@ -432,8 +462,8 @@ class Player:
             value = getattr(self, attr)
             if callable(value):
                 continue
-            if isinstance(value, WeekFPPGs):
-                value = str(value)
+            if isinstance(value, np.ndarray):
+                value = ", ".join("%.2f" % f for f in value)
             if isinstance(value, list):
                 value = ", ".join([str(v) for v in value])
             elif isinstance(value, dict):
@@ -522,30 +552,48 @@ class PlayerLookup:
     def __init__(self) -> None:
         self.sleeper: dict[str, Player] = {}
         self.name: dict[str, Player] = {}
-        self.id: dict[str, dict[str, Player]] = collections.defaultdict(dict)
+        self.table = PlayerTable(1024)
+        # Players by normalize_name(), for names spelled differently by sources
+        self.normalized: dict[str, Player] = {}
+        # Players by EXTERNAL_IDS kind, then id
+        self.id: dict[str, dict[str, Player]] = {kind: {} for kind in EXTERNAL_IDS}
 
     def add(self, player: Player) -> None:
+        count_load("players")
+        if player.table is not self.table:
+            self.table.adopt(player)
         self.sleeper[player.sleeper_id] = player
 
-        existing = self.name.get(player.name.unf)
-        if existing:
-            if player.search_rank > existing.search_rank:
-                logging.debug(f"{player.name} already in players_by_name, overwriting")
-                self.name[player.name.unf] = player
+        for index, key in (
+            (self.name, player.name.unf),
+            (self.normalized, normalize_name(player.name.unf)),
+        ):
+            existing = index.get(key)
+            if existing:
+                if player.search_rank > existing.search_rank:
+                    logging.debug(f"{player.name} already in players_by_name, overwriting")
+                    index[key] = player
+                else:
+                    logging.debug(
+                        f"{player.name} already in players_by_name, not overwriting"
+                    )
             else:
-                logging.debug(
-                    f"{player.name} already in players_by_name, not overwriting"
-                )
-        else:
-            self.name[player.name.unf] = player
+                index[key] = player
+
+        for kind, index in self.id.items():
+            the_id = getattr(player, f"{kind}_id")
+            if the_id:
+                index[str(the_id)] = player
 
-        for attr in dir(player):
-            if attr.endswith("_id"):
-                the_id = getattr(player, attr)
-                if the_id:
-                    self.id[attr][getattr(player, attr)] = player
+    def find_by(self, id_kind: str, value: str | int) -> Player | None:
+        """Looks up a player by one of the EXTERNAL_IDS, e.g. ("espn", 3139477)."""
+        if id_kind not in self.id:
+            raise ValueError(f"Unknown id kind {id_kind}, expected one of {EXTERNAL_IDS}")
+        count_load("lookups")
+        return self.id[id_kind].get(str(value))
 
     def find(self, token: str) -> Player | None:
+        count_load("lookups")
         if token in teams:
             return None
 
@@ -557,25 +605,26 @@ class PlayerLookup:
         if p:
             return p
 
+        # Spelling differences between sources, e.g. "D.J." vs "DJ", suffixes
+        # and nicknames, almost always resolve without fuzzy matching.
+        p = self.normalized.get(normalize_name(token))
+        if p:
+            return p
+
         name = str(token)
         for suffix in [" Jr.", " Sr.", " III", " II"]:
             if name.endswith(suffix):
                 name = name[: -len(suffix)].strip()
-        p = self.name.get(name)
-        if p:
-            return p
-        if name.startswith("Marquise"):
-            p = self.name.get(name.replace("Marquise", "Hollywood"))
-            if p:
-                return p
 
+        count_load("fuzzy")
         tokens = process.extract(name, self.name.keys(), scorer=fuzz.token_set_ratio)
         tokens.sort(key=lambda x: x[1], reverse=True)
         new_name = tokens[0][0]
         if tokens[0][1] > 80:
             name = new_name
-            p = players.find(name)
+            p = self.name.get(name)
         else:
+            count_load("unresolved")
             logging.info("Could not resolve %s -> %s", name, new_name)
         return p
 
@@ -599,6 +648,10 @@ class FantasyTeam:
         player.fantasy_team = None
         self.calc_score()
 
+    @property
+    def is_me(self) -> bool:
+        return self.id == MY_USER_ID
+
     def calc_score(self) -> None:
         self.score = 0.0
         for player in self.players:
@@ -647,7 +700,8 @@ def load_2025_matchups(players: PlayerLookup) -> None:
             for week in weeks:
                 matchup = Matchup(week)
                 p.weeks.append(matchup)
-            p.calc_score()
+            players.table.set_weeks(p.row, [m.favor for m in p.weeks])
+        players.table.calc_scores(PERCENTAGE_POINTS_VAR)
 
 
 def load_sleeper() -> None:
@@ -744,7 +798,7 @@ def load_sleeper() -> None:
             if not matched_pos:
                 continue
 
-            p = Player(PlayerName(name), info.get("team"), matched_pos, 0, 0)
+            p = Player(PlayerName(name), info.get("team"), matched_pos, table=players.table)
             p.age = info.get("age", 0)
             p.weight = int(info.get("weight") or 0)
             p.experience = info.get("years_exp", None)
@@ -897,8 +951,7 @@ def load_sleeper() -> None:
 def load_league(players: PlayerLookup) -> None:
     global local_state, fantasy_team_roster_id
     with draft.lock:
-        for pl in players.sleeper.values():
-            pl.fantasy_team = None
+        players.table.clear_fantasy_teams()
 
         with open(USERS_FILE, "r") as f:
             for j in track(json.loads(f.read()), "Loading league"):
@@ -1170,81 +1223,413 @@ def load_projections_old(players: PlayerLookup) -> None:
 
 
 def do_rankings(players: PlayerLookup) -> None:
-    positions = ["QB", "RB", "WR", "TE", "K"]
-    all_players = []
-    by_position = collections.defaultdict(list)
-    for p in players.sleeper.values():
-        all_players.append(p)
-        by_position[p.position].append(p)
+    players.table.rank()
 
-    all_players.sort(key=lambda p: (-p.adj_projection(), p.pos_order(), p.last_name()))
-    for i, p in enumerate(all_players):
-        p.rank = i + 1
 
-    for pos in positions:
-        by_position[pos].sort(key=lambda p: (-p.adj_projection(), p.last_name()))
-        for i, p in enumerate(by_position[pos]):
-            p.positional_rank = i + 1
+def score_weekly(weekly: np.ndarray, n: int) -> np.ndarray:
+    """Scores combos from their points, indexed combo slot x combo x week.
 
+    Each week the best n of a combo play, and its best COMBOS_MAX_WEEK weeks
+    count.
+    """
+    k = len(weekly)
+    if n >= k:
+        weeks = weekly.sum(axis=0)
+    else:
+        # Keep the n best (or k - n worst) of each week by bubbling every slot
+        # through them, which is much faster than sorting each week's k points.
+        worst = k - n < n
+        keep, drop = (np.minimum, np.maximum) if worst else (np.maximum, np.minimum)
+        kept: list[np.ndarray] = []
+        for x in weekly:
+            for j, y in enumerate(kept):
+                kept[j], x = keep(y, x), drop(y, x)
+            if len(kept) < min(n, k - n):
+                kept.append(x)
+        weeks = sum(kept[1:], kept[0])
+        if worst:
+            weeks = weekly.sum(axis=0) - weeks
+    return score_weeks(weeks)
+
+
+def score_weeks(weeks: np.ndarray) -> np.ndarray:
+    """Sums the best COMBOS_MAX_WEEK weeks of each row of weekly points."""
+    num_weeks = weeks.shape[1]
+    if num_weeks > COMBOS_MAX_WEEK:
+        weeks = np.partition(weeks, num_weeks - COMBOS_MAX_WEEK, axis=1)[
+            :, num_weeks - COMBOS_MAX_WEEK :
+        ]
+    return weeks.sum(axis=1)
 
-def combo_score(players: list[Player], n: int) -> tuple[float, list[list[Player]]]:
-    wks: list[float] = []
-    play: list[list[Player]] = []
-    for i in range(COMBOS_NUM_GAMES):
-        players.sort(key=lambda p: -p.week_fppg(i))
-        play.append(players[0:n])
-        wks.append(sum(p.week_fppg(i) for p in play[-1]))
-    if len(wks) > COMBOS_MAX_WEEK:
-        wks = sorted(wks, reverse=True)[:COMBOS_MAX_WEEK]
-    return sum(wks), play
 
+def score_combos(fppgs: np.ndarray, combos: np.ndarray, n: int) -> np.ndarray:
+    """Scores each row of combos, which index the players in fppgs.
 
-type Combo = tuple[list[Player], float, list[list[Player]]]
+    fppgs has each player's points for the COMBOS_NUM_GAMES weeks.
+    """
+    # Combo slot x combo x week, so each slot is one contiguous array
+    return score_weekly(fppgs[combos.T], n)
 
 
-def do_combo(players: list[Player], n: int, m: int) -> list[Combo]:
-    picked: list[Player] = []
-    filtered: list[Player] = []
-    for p in players:
-        if p.picked:
-            picked.append(p)
-            continue
-        if p.taken:
-            continue
-        if p.age > MAX_AGE:
-            continue
-        if len(p.weeks) < 18:
-            continue
-        if p.injury_status is not None:
-            continue
-        filtered.append(p)
-    filtered.sort(key=lambda p: p.positional_rank)
+def combo_play(players: list[Player], n: int) -> list[list[Player]]:
+    """The n players of a combo to start each week."""
+    return [
+        sorted(players, key=lambda p: -p.week_fppg(i))[:n] for i in range(COMBOS_NUM_GAMES)
+    ]
+
+
+# The players, their score and how many of them play each week
+type Combo = tuple[list[Player], float, int]
+
+
+def undominated(fppgs: np.ndarray, needed: int) -> np.ndarray:
+    """Rows of fppgs not matched or beaten every week by needed others.
+
+    fppgs must be sorted by total points, best first, so every player's
+    dominators come before them, and only kept players count as dominators.
+    """
+    kept: list[int] = []
+    for i, x in enumerate(fppgs):
+        if len(kept) < needed or (fppgs[kept] >= x).all(axis=1).sum() < needed:
+            kept.append(i)
+    return np.array(kept, dtype=np.intp)
+
+
+@dataclass
+class ComboSearch:
+    """Branch-and-bound search for the top_k combos of slots candidates.
+
+    fppgs has the candidates, best first, then the picked players, who are in
+    every combo. Each week the best n of a combo play. A partial combo is only
+    extended while filling its open slots with each week's best remaining
+    points could still beat the worst combo kept.
+
+    A search picking up from an earlier one is given the rows of the earlier
+    combos still possible as known, and the worst score it kept as ceiling.
+    Every other combo scores at most that, so it only looks for the best
+    top_k of those.
+    """
+
+    fppgs: np.ndarray
+    num_candidates: int
+    slots: int
+    n: int
+    top_k: int | None
+    # Only combos scoring over floor are kept, for searches split across workers
+    floor: float = -math.inf
+    ceiling: float = math.inf
+    known: set[tuple[int, ...]] = field(default_factory=set)
+    # Min-heap of the best combos so far, as (score, rows), and their rows
+    best: list[tuple[float, list[int]]] = field(default_factory=list)
+    kept: set[tuple[int, ...]] = field(default_factory=set)
+    # best_left[i] is each week's best slots points from candidate i onwards
+    best_left: np.ndarray = field(init=False)
+
+    # Bounds are summed in a different order to scores, allow for rounding
+    SLACK = 1e-9
+
+    def __post_init__(self) -> None:
+        weeks = self.fppgs.shape[1]
+        self.best_left = np.full((self.num_candidates + 1, self.slots, weeks), -np.inf)
+        for i in reversed(range(self.num_candidates)):
+            merged = np.vstack([self.fppgs[i : i + 1], self.best_left[i + 1]])
+            self.best_left[i] = -np.sort(-merged, axis=0)[: self.slots]
+
+    def worst_kept(self) -> float:
+        if self.top_k is None or len(self.best) < self.top_k:
+            return self.floor
+        return max(self.floor, self.best[0][0])
+
+    def push(self, combo: tuple[float, list[int]]) -> None:
+        rows = tuple(combo[1])
+        if rows in self.kept or rows in self.known:
+            return
+        if self.top_k is None or len(self.best) < self.top_k:
+            heapq.heappush(self.best, combo)
+        elif combo > self.best[0]:
+            self.kept.remove(tuple(heapq.heapreplace(self.best, combo)[1]))
+        else:
+            return
+        self.kept.add(rows)
+
+    def branches(self, rows: list[int], start: int) -> tuple[np.ndarray, np.ndarray]:
+        """The next candidates to add to rows and their bounds, best first."""
+        left = self.slots - len(rows)
+        nexts = np.arange(start, self.num_candidates - left + 1)
+        prefix = np.array(rows + list(range(self.num_candidates, len(self.fppgs))), dtype=np.intp)
+        if left == 1:
+            block = np.hstack(
+                [np.broadcast_to(prefix, (len(nexts), len(prefix))), nexts[:, None]]
+            )
+            return nexts, score_combos(self.fppgs, block, self.n)
+        # This combo plus each next candidate plus the best points left each
+        # week for the remaining slots
+        weekly = np.concatenate(
+            [
+                np.broadcast_to(
+                    self.fppgs[prefix][:, None], (len(prefix), len(nexts), self.fppgs.shape[1])
+                ),
+                self.fppgs[nexts][None],
+                self.best_left[nexts + 1, : left - 1].transpose(1, 0, 2),
+            ]
+        )
+        bounds = score_weekly(weekly, self.n)
+        order = np.argsort(-bounds, kind="stable")
+        return nexts[order], bounds[order]
+
+    def search(self, rows: list[int], start: int) -> None:
+        nexts, bounds = self.branches(rows, start)
+        picked_rows = list(range(self.num_candidates, len(self.fppgs)))
+        if len(rows) + 1 == self.slots:
+            # The last slot's bounds are the scores
+            keep = np.flatnonzero(
+                (bounds > self.worst_kept()) & (bounds <= self.ceiling + self.SLACK)
+            )
+            # Some of the best may be known already
+            top = None if self.top_k is None else self.top_k + len(self.known)
+            if top is not None and len(keep) > top:
+                keep = keep[np.argpartition(bounds[keep], len(keep) - top)[len(keep) - top :]]
+            for i in keep.tolist():
+                self.push((bounds[i].item(), sorted(rows + [nexts[i].item()] + picked_rows)))
+            return
+        for lead, bound in zip(nexts.tolist(), bounds.tolist()):
+            if bound < self.worst_kept() - self.SLACK:
+                break
+            self.search(rows + [lead], lead + 1)
+
+
+def search_combo_leads(search: ComboSearch, leads: list[int]) -> list[tuple[float, list[int]]]:
+    """Runs search from each of leads as the first candidate, in a worker process."""
+    for lead in leads:
+        search.search([lead], lead + 1)
+    return search.best
+
+
+def run_combo_search(search: ComboSearch) -> None:
+    """Runs search, spreading it over COMBOS_WORKERS processes if it is slow.
+
+    The search is split by each combo's first candidate. Workers only keep
+    combos beating the worst one found so far, and their best are merged back.
+    """
+    if search.num_candidates < search.slots:
+        return
+    if search.slots == 1:
+        search.search([], 0)
+        return
+
+    nexts, bounds = search.branches([], 0)
+    leads = list(zip(nexts.tolist(), bounds.tolist()))
+    started = time.monotonic()
+    done = 0
+    for lead, bound in track(leads, description="Processing combinations"):
+        if bound < search.worst_kept() - search.SLACK:
+            break
+        if COMBOS_WORKERS > 1 and time.monotonic() - started > COMBOS_SERIAL_SECONDS:
+            break
+        search.search([lead], lead + 1)
+        done += 1
+
+    worst = search.worst_kept()
+    remaining = [lead for lead, bound in leads[done:] if bound >= worst - search.SLACK]
+    if not remaining:
+        return
+    # Hand out leads round-robin so every worker gets some of the best ones
+    num_tasks = min(len(remaining), COMBOS_WORKERS * 4)
+    worker = ComboSearch(
+        search.fppgs,
+        search.num_candidates,
+        search.slots,
+        search.n,
+        search.top_k,
+        floor=worst,
+        ceiling=search.ceiling,
+        known=search.known,
+    )
+    with concurrent.futures.ProcessPoolExecutor(COMBOS_WORKERS) as executor:
+        futures = [
+            executor.submit(search_combo_leads, worker, remaining[i::num_tasks])
+            for i in range(num_tasks)
+        ]
+        for future in track(
+            concurrent.futures.as_completed(futures),
+            description="Processing combinations",
+            total=len(futures),
+        ):
+            for combo in future.result():
+                search.push(combo)
+
+
+@dataclass
+class KnownCombos:
+    """The best combos found by a search, and the players it searched.
+
+    Picks only shrink the space of combos: another team's pick drops every
+    combo with that player, and mine drops every combo without them. So the
+    combos still possible after picks are still the best of what is left, down
+    to the worst of them.
+    """
+
+    # Each player's week_fppgs when searched, by sleeper id
+    pool: dict[str, bytes]
+    combos: list[Combo]
+    # The top_k searched for, if fewer were found they were every combo
+    top_k: int | None
+
+
+# The last combos found for each (position, num_draft, num_play)
+known_combos: dict[tuple[str, int, int], KnownCombos] = {}
+
+
+def do_combo(
+    picked: list[Player],
+    available: list[Player],
+    n: int,
+    m: int,
+    top_k: int | None,
+    known: KnownCombos | None = None,
+) -> KnownCombos:
+    """The top_k best scoring combos, or all of them if top_k is None, worst first.
+
+    Every available player is searched, see ComboSearch. Combos in known that
+    are still possible are reused, and if there are top_k of them no search is
+    needed at all. Otherwise only enough combos scoring no more than the worst
+    in known are searched for to make up top_k. known is only used if none of
+    the players' week_fppgs changed since.
+    """
+    filtered = [
+        p for p in available if len(p.weeks) >= 18 and p.injury_status is None
+    ]
 
     if len(picked) >= n:
         raise RuntimeError("More picked than combos")
+    slots = n - len(picked)
+    pool_fppgs = {
+        p.sleeper_id: p.week_fppgs[:COMBOS_NUM_GAMES].tobytes() for p in filtered + picked
+    }
+    if known is not None and any(known.pool.get(i) != f for i, f in pool_fppgs.items()):
+        # Someone came back into the pool, or their projection changed, so
+        # there may be better combos
+        known = None
+
+    # Best candidates first, so the bounds shrink quickly as the search goes on
+    fppgs = np.array([p.week_fppgs[:COMBOS_NUM_GAMES] for p in filtered])
+    fppgs = fppgs.reshape(len(filtered), COMBOS_NUM_GAMES)
+    order = np.argsort(-fppgs.sum(axis=1), kind="stable")
+    if top_k is not None:
+        # Any combo with a player dominated by slots - 1 + top_k others can
+        # swap them for an unused dominator top_k ways, each scoring at least
+        # as well, so they can never make the top_k.
+        order = order[undominated(fppgs[order], slots - 1 + top_k)]
+    candidates = [filtered[i] for i in order]
+
+    # Every combo is some of the candidates plus everyone already picked
+    pool = candidates + picked
+    search = ComboSearch(
+        np.vstack([fppgs[order]] + [p.week_fppgs[None, :COMBOS_NUM_GAMES] for p in picked]),
+        len(candidates),
+        slots,
+        m,
+        top_k,
+    )
+    reused: list[tuple[float, list[int]]] = []
+    if known is not None:
+        row = {p.sleeper_id: i for i, p in enumerate(pool)}
+        picked_ids = {p.sleeper_id for p in picked}
+        for players, score, _ in known.combos:
+            ids = {p.sleeper_id for p in players}
+            if picked_ids <= ids and ids <= row.keys():
+                reused.append((score, sorted(row[i] for i in ids)))
+        if top_k is not None:
+            reused = sorted(reused)[-top_k:]
+        if known.top_k is None or len(known.combos) < known.top_k:
+            # known has every combo there was
+            search.top_k = 0
+        else:
+            search.top_k = None if top_k is None else top_k - len(reused)
+            search.ceiling = known.combos[0][1]
+        search.known = {tuple(rows) for _, rows in reused}
+    if search.top_k is None or search.top_k > 0:
+        run_combo_search(search)
+    best = sorted(search.best + reused)
+    return KnownCombos(
+        pool_fppgs, [([pool[i] for i in rows], score, m) for score, rows in best], top_k
+    )
+
+
+def lineup_weekly(points: dict[str, np.ndarray]) -> np.ndarray:
+    """Each week's points from the best LINEUP of some rosters.
+
+    points[pos] is the roster's players at pos, indexed player x roster x week.
+    Every slot a position can fill is open to all the players of any narrower
+    slot, so filling each position's own slots with its best players, then
+    FLEX and then SF with the best left over is an exact assignment.
+    """
+    weekly: np.ndarray | None = None
+    left: list[tuple[frozenset[str], np.ndarray]] = []
+
+    def fill(positions: frozenset[str], ps: np.ndarray, num: int) -> None:
+        nonlocal weekly
+        ps = -np.sort(-ps, axis=0)
+        best = ps[:num].sum(axis=0)
+        weekly = best if weekly is None else weekly + best
+        left.append((positions, ps[num:]))
+
+    for pos, ps in points.items():
+        fill(frozenset([pos]), ps, LINEUP.get(pos, 0))
+    for slot, eligible in sorted(FLEX_POSITIONS.items(), key=lambda f: len(f[1])):
+        if not LINEUP.get(slot):
+            continue
+        ps = np.concatenate([ps for positions, ps in left if positions <= eligible])
+        left = [(positions, ps) for positions, ps in left if not positions <= eligible]
+        fill(eligible, ps, LINEUP[slot])
+    assert weekly is not None
+    return weekly
+
+
+def lineup_additions(roster: list[Player], available: list[Player]) -> list[tuple[Player, float]]:
+    """How many points each available player adds to roster's best lineups, best first.
+
+    Every available player at a position is scored as one block.
+    """
+    positions = {pos for pos in LINEUP if pos not in FLEX_POSITIONS}
+    for slot, eligible in FLEX_POSITIONS.items():
+        if LINEUP.get(slot):
+            positions |= eligible
+
+    def points(ps: list[Player]) -> np.ndarray:
+        return np.array([p.week_fppgs[:COMBOS_NUM_GAMES] for p in ps]).reshape(
+            len(ps), COMBOS_NUM_GAMES
+        )
 
-    limit = 50
-    if n > 4:
-        limit = 30
-    elif n > 3:
-        limit = 50
+    mine = {pos: points([p for p in roster if p.position == pos])[:, None] for pos in positions}
+    base = score_weeks(lineup_weekly(mine)).item()
 
-    num_combos = math.comb(min(len(filtered), n), n - len(picked))
-    combos = itertools.combinations(filtered[:limit], n - len(picked))
-    ret = []
-    for c in track(combos, description="Processing combinations", total=num_combos):
-        co = list(c) + picked
-        score, play = combo_score(co, m)
-        ret.append((co, score, play))
-    ret.sort(key=lambda c: c[1])
-    return ret
+    additions: list[tuple[Player, float]] = []
+    for pos in positions:
+        candidates = [
+            p
+            for p in available
+            if p.position == pos and len(p.weeks) >= 18 and p.injury_status is None
+        ]
+        if not candidates:
+            continue
+        rosters = {
+            other: np.broadcast_to(ps, (len(ps), len(candidates), COMBOS_NUM_GAMES))
+            for other, ps in mine.items()
+        }
+        rosters[pos] = np.concatenate([rosters[pos], points(candidates)[None]])
+        scores = score_weeks(lineup_weekly(rosters))
+        additions.extend(zip(candidates, (scores - base).tolist()))
+    additions.sort(key=lambda a: -a[1])
+    return additions
 
 
 def print_combos(combos: list[Combo]) -> None:
     NUM_PRINT = 500
 
     rank = min(len(combos), NUM_PRINT)
-    for players, score, play in combos[-NUM_PRINT:]:
+    for players, score, num_play in combos[-NUM_PRINT:]:
+        play = combo_play(players, num_play)
         pstr = " - ".join([p.tostr(notes=False) for p in players])
         rstr = f"#{rank}/{len(combos)} - {score/18:.2f} - "
         pad = len(rstr) * " "
@@ -1257,16 +1642,9 @@ def print_combos(combos: list[Combo]) -> None:
         print()
 
 
-def by_pos(players: PlayerLookup) -> dict[str, list[Player]]:
-    by_position: dict[str, list[Player]] = collections.defaultdict(list)
-    for p in players.sleeper.values():
-        by_position[p.position].append(p)
-    return by_position
-
-
 def print_players() -> None:
     with draft.lock:
-        for p in sorted(players.sleeper.values(), key=lambda p: p.adj_projection()):
+        for p in players.table.select(order=players.table.adj_projection()):
             print(p.tostr())
 
 
@@ -1311,11 +1689,20 @@ def print_prospects() -> None:
 
 
 def do_combos(
-    players: PlayerLookup, pos: str, num_draft: int, num_play: int
+    players: PlayerLookup, pos: str, num_draft: int, num_play: int, top_k: int | None
 ) -> list[Combo]:
-    by_position = by_pos(players)
-    combos = do_combo(by_position[pos], num_draft, num_play)
-    return combos
+    table = players.table
+    in_pos = table.position(pos)
+    picked = table.select(in_pos & table.picked())
+    available = table.select(
+        in_pos & table.available() & (table.column("age") <= MAX_AGE),
+        order=table.column("positional_rank"),
+    )
+    key = (pos, num_draft, num_play)
+    known_combos[key] = do_combo(
+        picked, available, num_draft, num_play, top_k, known_combos.get(key)
+    )
+    return list(known_combos[key].combos)
 
 
 def print_roster() -> None:
@@ -1439,7 +1826,7 @@ def draft_analyze(verbose: bool = True) -> None:
         with draft.lock:
             try:
                 cs = do_combos(
-                    players, pos, DRAFT_SETTINGS[pos][1], DRAFT_SETTINGS[pos][0]
+                    players, pos, DRAFT_SETTINGS[pos][1], DRAFT_SETTINGS[pos][0], COMBOS_TOP_K
                 )
             except RuntimeError as e:
                 logging.error(f"Error running combos for {pos}: {e}")
@@ -1449,7 +1836,7 @@ def draft_analyze(verbose: bool = True) -> None:
         i = 0
         num_print = max(NUM_RECOMMEND, n * 2)
         for c in cs:
-            ps, score, play = c
+            ps, score, _ = c
             for p in ps:
                 if p.fantasy_team:
                     continue
@@ -1471,11 +1858,23 @@ def draft_analyze(verbose: bool = True) -> None:
         for i, sleeper_id in enumerate(list(top)):
             print(f"{i+1}.", players.sleeper[sleeper_id].tostr())
 
+    if any(LINEUP.get(slot) for slot in FLEX_POSITIONS):
+        with draft.lock:
+            table = players.table
+            additions = lineup_additions(
+                team.players, table.select(table.available() & (table.column("age") <= MAX_AGE))
+            )
+        print()
+        print_header("Top lineup additions")
+        for i, (p, gain) in enumerate(additions[: NUM_RECOMMEND * 2]):
+            print(f"{i+1}. +{gain/18:.2f}", p.tostr())
+
 
 def sleeper_auctions() -> None:
-    ps = sorted(
-        players.sleeper.values(), key=lambda p: p.draft_value - p.sleeper_auction_value
-    )
+    player_table = players.table
+    auction_value = player_table.column("sleeper_auction_value")
+    savings = player_table.column("draft_value") - auction_value
+    ps = player_table.select((auction_value != 0) & (savings > 0), order=savings)
 
     table = Table(title=f"Sleeper Auction Comp")
     table.add_column("Value", justify="right", style="cyan")
@@ -1484,11 +1883,7 @@ def sleeper_auctions() -> None:
     table.add_column("Player")
 
     for p in ps:
-        if not p.sleeper_auction_value:
-            continue
         diff = p.draft_value - p.sleeper_auction_value
-        if diff <= 0:
-            continue
         table.add_row(
             f"${p.draft_value}",
             f"${p.sleeper_auction_value}",
@@ -1511,12 +1906,11 @@ def print_tier_info(pos: str, tier: int, only_available=False) -> None:
     total_price = 0
 
     with draft.lock:
-        for p in players.sleeper.values():
-            if pos == OVERALL_TIER:
-                if p.overall_tier != tier:
-                    continue
-            elif p.position != pos or p.pos_tier != tier:
-                continue
+        if pos == OVERALL_TIER:
+            in_tier = players.table.column("overall_tier") == tier
+        else:
+            in_tier = players.table.position(pos) & (players.table.column("pos_tier") == tier)
+        for p in players.table.select(in_tier):
             ps.append(p)
             if p.actual_draft_pos is not None:
                 if p.actual_draft_pos == 0:
@@ -1679,7 +2073,7 @@ def input_combos() -> None:
     assert num_draft is not None
 
     with draft.lock:
-        combos = do_combos(players, pos, num_draft, num_play)
+        combos = do_combos(players, pos, num_draft, num_play, COMBOS_TOP_K)
     print_combos(combos)
 
 
@@ -1753,35 +2147,57 @@ def main() -> None:
 
     load_config(args.config)
 
+    profile = StartupProfile() if args.profile_startup else None
+
+    def stage(name: str) -> Any:
+        if profile:
+            return profile.stage(name)
+        return contextlib.nullcontext()
+
     if args.refresh:
-        download_nfl_players()
+        with stage("download_players"):
+            download_nfl_players()
 
-    load_sleeper()
-    load_draft_values(players)
+    with stage("sleeper"):
+        load_sleeper()
+    with stage("draft_values"):
+        load_draft_values(players)
 
     # TODO
-    load_draft_values_gen(players)
+    with stage("draft_values_gen"):
+        load_draft_values_gen(players)
 
-    load_ol_def_rankings(players)
-    load_keeper_costs(players)
-    load_extra(players)
+    with stage("ol_def_rankings"):
+        load_ol_def_rankings(players)
+    with stage("keeper_costs"):
+        load_keeper_costs(players)
+    with stage("extra"):
+        load_extra(players)
 
-    load_2025_matchups(players)
-    do_rankings(players)
+    with stage("matchups"):
+        load_2025_matchups(players)
+    with stage("rankings"):
+        do_rankings(players)
 
     if args.refresh:
-        refresh_rosters()
-    load_league(players)
+        with stage("refresh_rosters"):
+            refresh_rosters()
+    with stage("league"):
+        load_league(players)
 
     if DRAFT_ID and PRE_DRAFT:
-        if args.refresh:
-            draft.refresh()
-            draft.start()
-        elif args.sim:
-            REFRESH_RATE = 5
-            draft.start_sim()
-        else:
-            draft.load()
+        with stage("draft"):
+            if args.refresh:
+                draft.refresh()
+                draft.start()
+            elif args.sim:
+                REFRESH_RATE = 5
+                draft.start_sim()
+            else:
+                draft.load()
+
+    if profile:
+        profile.report(args.profile_startup)
 
     def ex() -> bool:
         sys.exit(0)
@@ -1814,6 +2230,7 @@ def main() -> None:
 
 
 def parse_args() -> argparse.Namespace:
+    global VERBOSE, MAX_AGE, COMBOS_TOP_K
     parser = argparse.ArgumentParser(
         description="analyze", formatter_class=argparse.RawTextHelpFormatter
     )
@@ -1826,11 +2243,26 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-c", "--config", dest="config", default=DEFAULT_CONFIG_NAME)
     parser.add_argument("-v", "--verbose", dest="verbose", action="store_true")
     parser.add_argument("--max-age", dest="max_age", type=int, default=100)
+    parser.add_argument(
+        "--top-combos",
+        dest="top_combos",
+        type=int,
+        default=COMBOS_TOP_K,
+        help=f"Number of best combos to keep (default {COMBOS_TOP_K})",
+    )
     parser.add_argument("--refresh", dest="refresh", action="store_true")
-    global VERBOSE, MAX_AGE
+    parser.add_argument(
+        "--profile-startup",
+        dest="profile_startup",
+        nargs="?",
+        const=PROFILE_FILE,
+        help=f"Time each load stage and write the results to a JSON file"
+        f" (default {PROFILE_FILE})",
+    )
     args = parser.parse_args()
     VERBOSE = args.verbose
     MAX_AGE = args.max_age
+    COMBOS_TOP_K = args.top_combos
     return args
 
 
@@ -3,17 +3,24 @@ import bs4
 from dataclasses import dataclass, field
 from enum import Enum
 import collections
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import itertools
 import argparse
 import csv
 import datetime
+import hashlib
 import json
 import os
 import sys
 import termios
 import threading
 import time
+import tracemalloc
+import unicodedata
 import logging
+import operator
+import pickle
 import re
 import urllib.request
 
@@ -21,12 +28,15 @@ import texteditor  # type: ignore[import-untyped]
 import textwrap
 import math
 import getpass
+import types
 from fzf import Fzf, fzf  # type: ignore[import-untyped]
 
 from functools import cache
 from thefuzz import process, fuzz  # type: ignore[import-untyped]
+import numpy as np
+import rapidfuzz
 from rich import print
-from rich.progress import track
+from rich.progress import Progress, track
 from rich.highlighter import Highlighter
 from rich.panel import Panel
 from rich.table import Table
@@ -50,6 +60,7 @@ PRE_DRAFT = True
 # many points per star to each game to get their per-game forecast.
 PERCENTAGE_POINTS_VAR = 0.3
 MAX_AGE = 100
+WEEKS = 18
 
 DEFAULT_CONFIG_NAME = f"osb"
 
@@ -85,6 +96,30 @@ ROUTES_RUN_FILE = "data/2024_first_down_per_route_run.csv"
 
 OSB_ROS_FILE = "data/one-street-bowl-ros-rankings.csv"
 
+# Warm-start snapshots of the loaded player universe, one checkpoint per load
+# stage. A checkpoint is reused when none of the input files of its stage, or of
+# any stage before it, have changed. Pass --no-snapshot to always load from the
+# raw files.
+SNAPSHOT_DIR = "data/snapshots"
+
+# Load stages that don't depend on each other run concurrently on this many
+# threads.
+LOAD_WORKERS = 4
+
+# Where --profile-startup writes the per-stage timings, for comparing startup
+# across data refreshes.
+PROFILE_FILE = "data/startup_profile.json"
+
+# Names that needed fuzzy matching, and the sleeper ID each resolved to, by the
+# source file they came from. Reused until the sleeper players file changes.
+RESOLUTIONS_FILE = "data/name_resolutions.json"
+
+# Rows read and player lookups made while loading, reported by --profile-startup.
+LOAD_STATS: collections.Counter[str] = collections.Counter()
+# Loader stages in the same wave run on a thread pool and all count into
+# LOAD_STATS, so go through count_load.
+LOAD_STATS_LOCK = threading.Lock()
+
 
 def download_file(url: str, filename: str) -> None:
     try:
@@ -98,7 +133,164 @@ def download_file(url: str, filename: str) -> None:
         logging.error(f"Error downloading {filename}: {e}")
 
 
+# Name suffixes and nicknames that sources disagree on. Nicknames are keyed by
+# the first name used in rankings files and map to sleeper's first name.
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+NICKNAMES = {
+    "marquise": "hollywood",
+    "gabe": "gabriel",
+    "chig": "chigoziem",
+    "tank": "nathaniel",
+}
+
+
+# Spellings of positions and teams in rankings files that differ from sleeper's
+POSITION_ALIASES = {"DST": "DEF", "D/ST": "DEF", "PK": "K"}
+TEAM_ALIASES = {"JAC": "JAX", "LVR": "LV", "WSH": "WAS", "LA": "LAR"}
+
+# Player "<kind>_id" fields indexed by PlayerLookup.find_by(). Sources with a
+# "<kind>_id" column are joined on it before falling back to the name.
+EXTERNAL_IDS = ("espn", "yahoo", "gsis", "rotowire", "sportradar", "fantasy_data", "stats")
+
+
+def normalize_name(name: str) -> str:
+    """Reduces a player name to the form used by PlayerLookup.normalized.
+
+    Accents, case, punctuation, apostrophes and Jr./Sr./II/III suffixes are
+    dropped, initials are joined ("D. J." and "DJ" are both "dj") and known
+    nicknames are replaced.
+    """
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = re.sub(r"['.]", "", name.lower())
+    words = re.sub(r"[^a-z0-9]+", " ", name).split()
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    joined: list[str] = []
+    initials = False
+    for w in words:
+        if len(w) == 1 and initials:
+            joined[-1] += w
+        else:
+            joined.append(w)
+            initials = len(w) == 1
+    if joined:
+        joined[0] = NICKNAMES.get(joined[0], joined[0])
+    return " ".join(joined)
+
+
+def strip_name_suffix(name: str) -> str:
+    for suffix in [" Jr.", " Sr.", " III", " II"]:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)].strip()
+    return name
+
+
+def row_hints(row: dict[str, str], position: str = "", team: str = "") -> dict[str, str]:
+    """Returns PlayerLookup.find_many() hints from a csv row's columns."""
+    hint = {
+        "position": row[position] if position else "",
+        "team": row[team] if team else "",
+    }
+    for kind in EXTERNAL_IDS:
+        if row.get(f"{kind}_id"):
+            hint[kind] = row[f"{kind}_id"]
+    return hint
+
+
+def count_load(stat: str, n: int = 1) -> None:
+    with LOAD_STATS_LOCK:
+        LOAD_STATS[stat] += n
+
+
+def counted(sequence: Any) -> Any:
+    for item in sequence:
+        count_load("rows")
+        yield item
+
+
+def file_hash(filename: str) -> str:
+    if not filename or not os.path.exists(filename):
+        return "missing"
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_json_items(f: Any, chunk_size: int = 1 << 20) -> Any:
+    """Yields the (key, value) pairs of a top-level JSON object one at a time.
+
+    Only one chunk of the file and the value being decoded are held in memory,
+    so large dumps like the sleeper players file never need to be fully loaded.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str) -> str:
+        # Skips whitespace and then one of chars, returning the char skipped.
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                break
+            if not fill():
+                raise ValueError("Unexpected end of JSON object")
+        c = buf[pos]
+        if c not in chars:
+            raise ValueError(f"Expected one of {chars!r} at {c!r}")
+        pos += 1
+        return c
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A value ending exactly at the end of the buffer could be a
+                # truncated number, so only trust it once more data is read.
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    skip("{")
+    if skip('"}') == "}":
+        return
+    pos -= 1
+    while True:
+        key = decode()
+        skip(":")
+        yield key, decode()
+        if skip(",}") == "}":
+            return
+
+
 class Matchup:
+    # Matchups don't change once loaded and are shared by every player with
+    # the same opponent and favor that week, see Loader.load_2025_matchups().
+    __slots__ = ("is_home", "is_bye", "opponent", "favor")
+
     def __init__(self, arr: list[str]) -> None:
         self.is_home = arr[1].startswith("@")
         self.is_bye = arr[1].startswith("BYE")
@@ -131,16 +323,6 @@ class Team:
         return f"[bold #{self.color}]{self.long_name}[/bold #{self.color}]"
 
 
-class WeekFPPGs(collections.UserList[float]):
-    def __init__(self, obj: Any | None = None) -> None:
-        super().__init__(obj if obj else list())
-        for _ in range(18):
-            self.append(0.0)
-
-    def __str__(self) -> str:
-        return ", ".join("%.2f" % f for f in self)
-
-
 class PlayerName(str):
     @property
     def unf(self) -> str:
@@ -150,83 +332,375 @@ class PlayerName(str):
         return f"[bold blue]{super().__str__()}[/bold blue]"
 
 
-@dataclass
+@dataclass(slots=True)
+class PlayerInfo:
+    """Player metadata from the sleeper players file that is rarely read."""
+
+    height: int = 0
+    weight: int = 0
+    experience: int | None = None
+    number: int = 0
+    birth_date: str = ""
+    college: str = ""
+    injury_status: str = ""
+    injury_notes: str = ""
+    search_rank: str = ""
+    channel_id: str = ""
+    fantasy_data_id: str = ""
+    pandascore_id: str = ""
+    opta_id: str = ""
+    sportradar_id: str = ""
+    yahoo_id: str = ""
+    gsis_id: str = ""
+    rotowire_id: str = ""
+    oddsjam_id: str = ""
+    swish_id: str = ""
+    player_id: str = ""
+    rotoworld_id: str = ""
+    espn_id: str = ""
+    stats_id: str = ""
+
+
+NO_INFO = PlayerInfo()
+
+
+def info_field(name: str) -> Any:
+    """Player property for a PlayerInfo field.
+
+    The PlayerInfo is only allocated once a field is set to something other
+    than its default, and None means missing from the players file, so it reads
+    back as the default.
+    """
+
+    def get(self: "Player") -> Any:
+        return getattr(self.info or NO_INFO, name)
+
+    def set(self: "Player", value: Any) -> None:
+        if self.info is None:
+            if value is None or value == getattr(NO_INFO, name):
+                return
+            self.info = PlayerInfo()
+        setattr(self.info, name, getattr(NO_INFO, name) if value is None else value)
+
+    return property(get, set)
+
+
+class PlayerTable:
+    """The numeric fields every analysis reads, as one numpy column per field.
+
+    Each Player owns a row and reads and writes these fields through it, so
+    filters, sorts and aggregates over all players can run on whole columns.
+    A Player made without a table starts out in DETACHED_TABLE, shared by
+    all of them, and moves into its PlayerLookup's table when added, freeing
+    its old row. Fantasy teams are stored as an index into fantasy_teams,
+    where 0 means not on a team.
+
+    WEEK_COLUMNS have a value per week: each matchup's favor (0 on bye weeks)
+    and the fantasy points per game calc_scores() projects from them.
+    """
+
+    COLUMNS: dict[str, tuple[Any, float]] = {
+        "projection": (np.float64, 0.0),
+        "adp": (np.float64, 1000.0),
+        "overall_tier": (np.int64, 15),
+        "pos_tier": (np.int64, 15),
+        "draft_value": (np.int64, 0),
+        "sleeper_auction_value": (np.int64, 0),
+        "keeper_cost": (np.int64, 0),
+        "age": (np.int64, 0),
+        "rank": (np.int64, 0),
+        "positional_rank": (np.int64, 0),
+        "projected_games_missed": (np.float64, 0.0),
+        "fantasy_team": (np.int16, 0),
+        "num_weeks": (np.int64, 0),
+    }
+    WEEK_COLUMNS: dict[str, Any] = {
+        "favor": np.int8,
+        "week_fppgs": np.float64,
+    }
+
+    def __init__(self, capacity: int = 1) -> None:
+        self.size = 0
+        self.players: list[Any] = []
+        # Positions are fixed when a Player is created, so they're copied here
+        self.positions = np.empty(capacity, dtype="U4")
+        self.columns = {
+            name: np.full(capacity, default, dtype=dtype)
+            for name, (dtype, default) in self.COLUMNS.items()
+        }
+        for name, dtype in self.WEEK_COLUMNS.items():
+            self.columns[name] = np.zeros((capacity, WEEKS), dtype=dtype)
+        self.fantasy_teams: list["FantasyTeam | None"] = [None]
+        self.fantasy_team_index: dict["FantasyTeam", int] = {}
+        # Loader stages on different threads make Players in the same table
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, player: Any) -> int:
+        with self.lock:
+            capacity = len(self.positions)
+            if self.size == capacity:
+                self.positions = np.resize(self.positions, capacity * 2)
+                for name, column in self.columns.items():
+                    default = self.COLUMNS[name][1] if name in self.COLUMNS else 0
+                    grown = np.full((capacity * 2, *column.shape[1:]), default, dtype=column.dtype)
+                    grown[:capacity] = column
+                    self.columns[name] = grown
+            row = self.size
+            self.positions[row] = player.position
+            self.players.append(player)
+            self.size += 1
+            return row
+
+    def remove(self, row: int) -> None:
+        """Frees row by moving the last row into it. Needs self.lock."""
+        last = self.size - 1
+        if row != last:
+            moved = self.players[last]
+            self.players[row] = moved
+            self.positions[row] = self.positions[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved.row = row
+        self.players.pop()
+        for name, column in self.columns.items():
+            column[last] = self.COLUMNS[name][1] if name in self.COLUMNS else 0
+        self.size -= 1
+
+    def adopt(self, player: Any) -> None:
+        """Moves player's row from the table it's in to this one."""
+        table = player.table
+        with table.lock:
+            row = player.row
+            values = {name: column[row].copy() for name, column in table.columns.items()}
+            fantasy_team = table.fantasy_teams[values["fantasy_team"]]
+            table.remove(row)
+        new_row = self.append(player)
+        for name, column in self.columns.items():
+            column[new_row] = values[name]
+        player.table, player.row = self, new_row
+        player.fantasy_team = fantasy_team
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name][: self.size]
+
+    def team_index(self, team: "FantasyTeam | None") -> int:
+        if team is None:
+            return 0
+        index = self.fantasy_team_index.get(team)
+        if index is None:
+            index = self.fantasy_team_index[team] = len(self.fantasy_teams)
+            self.fantasy_teams.append(team)
+        return index
+
+    def clear_fantasy_teams(self) -> None:
+        self.columns["fantasy_team"][:] = 0
+        self.fantasy_teams = [None]
+        self.fantasy_team_index = {}
+
+    def position(self, pos: str) -> np.ndarray:
+        return self.positions[: self.size] == pos
+
+    def adj_projection(self) -> np.ndarray:
+        return self.column("projection") * (17 - self.column("projected_games_missed")) / 17
+
+    def set_weeks(self, row: int, favors: Sequence[int]) -> None:
+        self.columns["num_weeks"][row] = len(favors)
+        self.columns["favor"][row, : len(favors)] = favors
+
+    def calc_scores(self, percentage_points_var: float) -> None:
+        """Computes week_fppgs for every player, see PERCENTAGE_POINTS_VAR.
+
+        Call again after projections, projected games missed or
+        percentage_points_var change.
+        """
+        num_weeks = self.column("num_weeks")
+        favor = self.column("favor")
+        proj = self.adj_projection()
+        variable = proj * percentage_points_var
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fixed = (proj - variable) / (num_weeks - 1)
+            points_per_star = variable / favor.sum(axis=1)
+        self.column("week_fppgs")[:] = np.where(
+            favor != 0, fixed[:, None] + points_per_star[:, None] * favor, 0.0
+        )
+
+    def pos_order(self) -> np.ndarray:
+        order = np.full(self.size, 10)
+        for i, pos in enumerate(("QB", "RB", "WR", "TE", "K")):
+            order[self.position(pos)] = i + 1
+        return order
+
+    def picked(self) -> np.ndarray:
+        is_me = np.array([t is not None and t.is_me for t in self.fantasy_teams])
+        return is_me[self.column("fantasy_team")]
+
+    def taken(self) -> np.ndarray:
+        return (self.column("fantasy_team") != 0) & ~self.picked()
+
+    def available(self) -> np.ndarray:
+        return self.column("fantasy_team") == 0
+
+    def rank(self) -> None:
+        """Sets rank and positional_rank by adjusted projection."""
+        adj_projection = self.adj_projection()
+        last_names = np.array([p.last_name() for p in self.players])
+
+        order = np.lexsort((last_names, self.pos_order(), -adj_projection))
+        self.column("rank")[order] = np.arange(1, self.size + 1)
+
+        # Rows sorted by projection then name, so each position's rows are
+        # ranked in the order they appear.
+        order = np.lexsort((last_names, -adj_projection))
+        positional_rank = self.column("positional_rank")
+        for pos in ("QB", "RB", "WR", "TE", "K"):
+            rows = order[self.position(pos)[order]]
+            positional_rank[rows] = np.arange(1, len(rows) + 1)
+
+    def select(self, mask: np.ndarray | None = None, order: np.ndarray | None = None) -> list[Any]:
+        """Players where mask is true, in order of the order keys."""
+        rows = np.arange(self.size)
+        if order is not None:
+            rows = np.argsort(order, kind="stable")
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return [self.players[i] for i in rows]
+
+
+# The table of Players made without one, see PlayerTable
+DETACHED_TABLE = PlayerTable(64)
+
+
+def column(name: str) -> Any:
+    """Player property for a PlayerTable column. None stores the default.
+
+    Integer columns only take whole numbers rather than truncating.
+    """
+    dtype, default = PlayerTable.COLUMNS[name]
+    integral = np.issubdtype(dtype, np.integer)
+
+    def get(self: Any) -> Any:
+        return self.table.columns[name].item(self.row)
+
+    def set(self: Any, value: Any) -> None:
+        if value is None:
+            value = default
+        elif integral and value != int(value):
+            raise ValueError(f"{name} must be a whole number, got {value!r}")
+        self.table.columns[name][self.row] = value
+
+    return property(get, set)
+
+
+def fantasy_team_column() -> Any:
+    def get(self: Any) -> "FantasyTeam | None":
+        return self.table.fantasy_teams[self.table.columns["fantasy_team"].item(self.row)]
+
+    def set(self: Any, team: "FantasyTeam | None") -> None:
+        self.table.columns["fantasy_team"][self.row] = self.table.team_index(team)
+
+    return property(get, set)
+
+
+@dataclass(slots=True)
 class Player:
     name: PlayerName
     team_name: str
     position: str
-    rank: int
-    positional_rank: int
-    score = 0.0
-    fppg = 0.0
-    age = 0
-    height = 0
-    weight = 0
-    experience = None
-    number = 0
-    status = "UNK"
-    sleeper_id = ""
-    projection = 0.0
-    keeper_cost = 0
-    draft_value = 0
-    actual_cost = 0
+    score: float = 0.0
+    fppg: float = 0.0
+    status: str = "UNK"
+    sleeper_id: str = ""
+    actual_cost: int = 0
     actual_draft_pos: int | None = None
-    fantasy_team: "FantasyTeam | None" = None
-    is_override = False
+    is_override: bool = False
 
-    depth_chart_position = "UN"
-    depth_chart_order = 100
+    depth_chart_position: str = "UN"
+    depth_chart_order: int = 100
 
-    adp = 1000.0
-    overall_tier = 15
-    pos_tier = 15
-    is_keeper = False
-    sleeper_auction_value = 0.0
+    is_keeper: bool = False
     ds_note: str | None = None
 
     team: Team | None = None
 
-    injury_risk = "Unknown"
-    career_injuries = 0
-    injury_risk_per_season = 0.0
-    durability = 0.0
-    projected_games_missed = 0.0
+    injury_risk: str = "Unknown"
+    career_injuries: int = 0
+    injury_risk_per_season: float = 0.0
+    durability: float = 0.0
 
     weeks: list[Matchup] = field(default_factory=list)
-    week_fppgs: WeekFPPGs = field(default_factory=WeekFPPGs)
-
-    routes_run = 0
-    first_downs_per_route_run = 0.0
-    first_downs_per_route_run_rank = 0
-
-    channel_id = ""
-    fantasy_data_id = ""
-    pandascore_id = ""
-    opta_id = ""
-    sportradar_id = ""
-    yahoo_id = ""
-    gsis_id = ""
-    birth_date = ""
-    rotowire_id = ""
-    oddsjam_id = ""
-    search_rank = ""
-    swish_id = ""
-    player_id = ""
-    rotoworld_id = ""
-    espn_id = ""
-    stats_id = ""
-    injury_status = ""
-    injury_notes = ""
-    college = ""
+
+    routes_run: int = 0
+    first_downs_per_route_run: float = 0.0
+    first_downs_per_route_run_rank: int = 0
+
     notes: list[str] = field(default_factory=list)
+    info: PlayerInfo | None = None
+    table: PlayerTable = field(default=DETACHED_TABLE, repr=False, compare=False)
+    row: int = field(default=-1, init=False, repr=False, compare=False)
+
+    projection = column("projection")
+    adp = column("adp")
+    overall_tier = column("overall_tier")
+    pos_tier = column("pos_tier")
+    draft_value = column("draft_value")
+    sleeper_auction_value = column("sleeper_auction_value")
+    keeper_cost = column("keeper_cost")
+    age = column("age")
+    rank = column("rank")
+    positional_rank = column("positional_rank")
+    projected_games_missed = column("projected_games_missed")
+    fantasy_team = fantasy_team_column()
+
+    height = info_field("height")
+    weight = info_field("weight")
+    experience = info_field("experience")
+    number = info_field("number")
+    birth_date = info_field("birth_date")
+    college = info_field("college")
+    injury_status = info_field("injury_status")
+    injury_notes = info_field("injury_notes")
+    search_rank = info_field("search_rank")
+    channel_id = info_field("channel_id")
+    fantasy_data_id = info_field("fantasy_data_id")
+    pandascore_id = info_field("pandascore_id")
+    opta_id = info_field("opta_id")
+    sportradar_id = info_field("sportradar_id")
+    yahoo_id = info_field("yahoo_id")
+    gsis_id = info_field("gsis_id")
+    rotowire_id = info_field("rotowire_id")
+    oddsjam_id = info_field("oddsjam_id")
+    swish_id = info_field("swish_id")
+    player_id = info_field("player_id")
+    rotoworld_id = info_field("rotoworld_id")
+    espn_id = info_field("espn_id")
+    stats_id = info_field("stats_id")
+
+    def __post_init__(self) -> None:
+        self.row = self.table.append(self)
 
     def __hash__(self) -> int:
         return hash(self.sleeper_id)
 
+    @property
+    def week_fppgs(self) -> np.ndarray:
+        return self.table.columns["week_fppgs"][self.row]
+
     def week_fppg(self, i: int) -> float:
         if i >= len(self.weeks):
             return 0.0
-        return self.week_fppgs[i]
+        return self.table.columns["week_fppgs"].item(self.row, i)
 
     def adj_projection(self) -> float:
         return self.projection * (17 - self.projected_games_missed) / 17
@@ -234,20 +708,6 @@ class Player:
     def name_str(self) -> str:
         return f"[bold blue]{self.name}[/bold blue]"
 
-    def calc_score(self) -> None:
-        stars = 0
-        proj = self.adj_projection()
-        for i in range(len(self.weeks)):
-            stars += self.weeks[i].favor
-        vari = proj * PERCENTAGE_POINTS_VAR
-        fixed = (proj - vari) / (len(self.weeks) - 1)
-        points_per_star = vari / stars
-        for i in range(len(self.weeks)):
-            if self.weeks[i].favor == 0:
-                self.week_fppgs[i] = 0
-            else:
-                self.week_fppgs[i] = fixed + points_per_star * self.weeks[i].favor
-
     @property
     def picked(self) -> bool:
         return self.fantasy_team is not None and self.fantasy_team.is_me
@@ -347,8 +807,8 @@ class Player:
             value = getattr(self, attr)
             if callable(value):
                 continue
-            if isinstance(value, WeekFPPGs):
-                value = str(value)
+            if isinstance(value, np.ndarray):
+                value = ", ".join("%.2f" % f for f in value)
             if isinstance(value, list):
                 value = ", ".join([str(v) for v in value])
             elif isinstance(value, dict):
@@ -580,10 +1040,18 @@ class Draft:
 
 
 class PlayerLookup:
+    # Attributes built by the load stages and persisted in warm-start
+    # snapshots. Fantasy teams are rebuilt from the league files every run.
+    SNAPSHOT_FIELDS = ("sleeper", "name", "normalized", "id", "teams", "table")
+
     def __init__(self) -> None:
         self.sleeper: dict[str, Player] = {}
         self.name: dict[str, Player] = {}
-        self.id: dict[str, dict[str, Player]] = collections.defaultdict(dict)
+        self.table = PlayerTable(1024)
+        # Players by normalize_name(), for names spelled differently by sources
+        self.normalized: dict[str, Player] = {}
+        # Players by EXTERNAL_IDS kind, then id
+        self.id: dict[str, dict[str, Player]] = {kind: {} for kind in EXTERNAL_IDS}
         self.fantasy_teams = {
             "": UNKNOWN_TEAM,
         }
@@ -594,63 +1062,230 @@ class PlayerLookup:
             0: UNKNOWN_TEAM,
         }
         self.teams: dict[str, Team] = {}
+        # Fuzzy name resolutions by source, then raw name, see RESOLUTIONS_FILE
+        self.resolutions: dict[str, dict[str, str | None]] = {}
+        self.resolutions_changed = False
+        # Stages in the same Loader wave resolve names from different threads
+        self.resolutions_lock = threading.Lock()
+        self.resolutions_file = ""
+        self.players_hash = ""
+
+
+    def load_resolutions(self, filename: str, players_hash: str) -> None:
+        self.resolutions_file = filename
+        self.players_hash = players_hash
+        if not os.path.exists(filename):
+            return
+        try:
+            with open(filename, "r") as f:
+                j = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable name resolutions {filename}: {e}")
+            return
+        if j.get("players_hash") != players_hash:
+            logging.info("Players file changed, discarding name resolutions")
+            return
+        self.resolutions = j.get("resolutions", {})
+
+
+    def save_resolutions(self) -> None:
+        with self.resolutions_lock:
+            if not self.resolutions_file or not self.resolutions_changed:
+                return
+            with open(f"{self.resolutions_file}.tmp", "w") as f:
+                json.dump(
+                    {
+                        "players_hash": self.players_hash,
+                        "resolutions": self.resolutions,
+                    },
+                    f,
+                    indent=4,
+                    sort_keys=True,
+                )
+            os.replace(f"{self.resolutions_file}.tmp", self.resolutions_file)
+            self.resolutions_changed = False
 
 
     def add(self, player: Player) -> None:
+        count_load("players")
+        if player.table is not self.table:
+            self.table.adopt(player)
         self.sleeper[player.sleeper_id] = player
 
-        existing = self.name.get(player.name.unf)
-        if existing:
-            if player.search_rank > existing.search_rank:
-                logging.debug(f"{player.name} already in players_by_name, overwriting")
-                self.name[player.name.unf] = player
+        for index, key in (
+            (self.name, player.name.unf),
+            (self.normalized, normalize_name(player.name.unf)),
+        ):
+            existing = index.get(key)
+            if existing:
+                if player.search_rank > existing.search_rank:
+                    logging.debug(f"{player.name} already in players_by_name, overwriting")
+                    index[key] = player
+                else:
+                    logging.debug(
+                        f"{player.name} already in players_by_name, not overwriting"
+                    )
             else:
-                logging.debug(
-                    f"{player.name} already in players_by_name, not overwriting"
-                )
-        else:
-            self.name[player.name.unf] = player
-
-        for attr in dir(player):
-            if attr.endswith("_id"):
-                the_id = getattr(player, attr)
-                if the_id:
-                    self.id[attr][getattr(player, attr)] = player
-
-    def find(self, token: str) -> Player | None:
+                index[key] = player
+
+        for kind, index in self.id.items():
+            the_id = getattr(player, f"{kind}_id")
+            if the_id:
+                index[str(the_id)] = player
+
+    def find_by(self, id_kind: str, value: str | int) -> Player | None:
+        """Looks up a player by one of the EXTERNAL_IDS, e.g. ("espn", 3139477)."""
+        if id_kind not in self.id:
+            raise ValueError(f"Unknown id kind {id_kind}, expected one of {EXTERNAL_IDS}")
+        count_load("lookups")
+        return self.id[id_kind].get(str(value))
+
+    def find_by_ids(self, hint: dict[str, str]) -> Player | None:
+        for kind in EXTERNAL_IDS:
+            if hint.get(kind):
+                p = self.find_by(kind, hint[kind])
+                if p:
+                    return p
+        return None
+
+    def find_fast(self, token: str, source: str) -> tuple[bool, Player | None]:
+        """Resolves token without fuzzy matching.
+
+        Returns whether token was resolved, which includes team names and names
+        previously found not to match any player, and the player.
+        """
         if token in self.teams:
-            return None
+            return True, None
 
         p = self.sleeper.get(token)
         if p:
-            return p
+            return True, p
 
         p = self.name.get(token)
         if p:
-            return p
+            return True, p
 
-        name = str(token)
-        for suffix in [" Jr.", " Sr.", " III", " II"]:
-            if name.endswith(suffix):
-                name = name[: -len(suffix)].strip()
-        p = self.name.get(name)
+        # Spelling differences between sources, e.g. "D.J." vs "DJ", suffixes
+        # and nicknames, almost always resolve without fuzzy matching.
+        p = self.normalized.get(normalize_name(token))
         if p:
+            return True, p
+
+        with self.resolutions_lock:
+            cached = self.resolutions.get(source, {})
+            found = token in cached
+            sleeper_id = cached.get(token)
+        if found:
+            count_load("cached")
+            if sleeper_id is None:
+                count_load("unresolved")
+                return True, None
+            if sleeper_id in self.sleeper:
+                return True, self.sleeper[sleeper_id]
+        return False, None
+
+    def resolved(self, token: str, source: str, p: Player | None) -> None:
+        with self.resolutions_lock:
+            self.resolutions.setdefault(source, {})[token] = p.sleeper_id if p else None
+            self.resolutions_changed = True
+
+    def find(self, token: str, source: str = "") -> Player | None:
+        count_load("lookups")
+        found, p = self.find_fast(token, source)
+        if found:
             return p
-        if name.startswith("Marquise"):
-            p = self.name.get(name.replace("Marquise", "Hollywood"))
-            if p:
-                return p
 
+        name = strip_name_suffix(token)
+        count_load("fuzzy")
         tokens = process.extract(name, self.name.keys(), scorer=fuzz.token_set_ratio)
         tokens.sort(key=lambda x: x[1], reverse=True)
         new_name = tokens[0][0]
         if tokens[0][1] > 80:
             name = new_name
-            p = self.find(name)
+            p = self.name.get(name)
         else:
+            count_load("unresolved")
             logging.info("Could not resolve %s -> %s", name, new_name)
+        self.resolved(token, source, p)
         return p
 
+    def find_many(
+        self,
+        tokens: Sequence[str],
+        hints: Sequence[dict[str, str]] | None = None,
+        source: str = "",
+    ) -> list[Player | None]:
+        """Resolves a batch of names, like calling find() on each.
+
+        hints has a "position" and "team" for each name when the source has
+        them, and any EXTERNAL_IDS it has, which are joined on exactly before
+        the name is looked at. Names that need fuzzy matching are scored together in one
+        rapidfuzz matrix per block of candidates: first players at the same
+        position on the same team, then at the same position, then everyone.
+        """
+        ret: list[Player | None] = [None] * len(tokens)
+        todo = []
+        for i, token in enumerate(tokens):
+            if hints and (p := self.find_by_ids(hints[i])):
+                ret[i] = p
+                continue
+            count_load("lookups")
+            found, ret[i] = self.find_fast(token, source)
+            if not found:
+                todo.append(i)
+        if not todo:
+            return ret
+        count_load("fuzzy", len(todo))
+
+        def block(i: int, level: int) -> tuple[str, ...]:
+            hint = hints[i] if hints else {}
+            position = POSITION_ALIASES.get(hint.get("position", ""), hint.get("position", ""))
+            team = TEAM_ALIASES.get(hint.get("team", ""), hint.get("team", ""))
+            if level == 2 and position and team in self.teams:
+                return (position, team)
+            if level == 1 and position:
+                return (position,)
+            return ()
+
+        names = [strip_name_suffix(tokens[i]) for i in todo]
+        best: dict[int, tuple[float, str]] = {}
+        for level in (2, 1, 0):
+            blocks: dict[tuple[str, ...], list[int]] = collections.defaultdict(list)
+            for n, i in enumerate(todo):
+                if i not in best or best[i][0] <= 80:
+                    blocks[block(i, level)].append(n)
+            if level:
+                blocks.pop((), None)
+            for key, ns in blocks.items():
+                choices = [
+                    name
+                    for name, p in self.name.items()
+                    if not key
+                    or (p.position == key[0] and (len(key) == 1 or p.team_name == key[1]))
+                ]
+                if not choices:
+                    continue
+                scores = rapidfuzz.process.cdist(
+                    [names[n] for n in ns],
+                    choices,
+                    scorer=rapidfuzz.fuzz.token_set_ratio,
+                    processor=rapidfuzz.utils.default_process,
+                    workers=-1,
+                )
+                for row, n in enumerate(ns):
+                    j = int(scores[row].argmax())
+                    best[todo[n]] = (round(float(scores[row][j])), choices[j])
+
+        for n, i in enumerate(todo):
+            score, new_name = best[i]
+            if score > 80:
+                ret[i] = self.name.get(new_name)
+            else:
+                count_load("unresolved")
+                logging.info("Could not resolve %s -> %s", names[n], new_name)
+            self.resolved(tokens[i], source, ret[i])
+        return ret
+
 
 class FantasyTeam:
     def __init__(self, name: str, team_id: str, is_me:bool) -> None:
@@ -809,19 +1444,223 @@ class LocalState:
             self.save()
 
 
+@dataclass
+class Stage:
+    """A step of Loader.load, run once every stage in deps has finished."""
+
+    name: str
+    fn: Callable[[], None]
+    deps: list[str] = field(default_factory=list)
+    # Files the stage reads and module settings it uses, which key its snapshot.
+    files: list[str] = field(default_factory=list)
+    params: list[Any] = field(default_factory=list)
+    # Whether the stage only builds PlayerLookup.SNAPSHOT_FIELDS, so that it
+    # can be restored from a snapshot instead of being run.
+    snapshot: bool = True
+
+
+def stage_waves(stages: list[Stage]) -> list[list[Stage]]:
+    """Groups stages into waves that only depend on earlier waves.
+
+    Stages must be listed after the stages they depend on.
+    """
+    level: dict[str, int] = {}
+    waves: list[list[Stage]] = []
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in level:
+                raise RuntimeError(f"Stage {stage.name} depends on unknown stage {dep}")
+        level[stage.name] = max((level[dep] + 1 for dep in stage.deps), default=0)
+        if level[stage.name] == len(waves):
+            waves.append([])
+        waves[level[stage.name]].append(stage)
+    return waves
+
+
+class Snapshot:
+    """Checkpoints of the PlayerLookup after each load wave, keyed by inputs.
+
+    The key of each wave chains the key of the wave before it with the hashes
+    of the input files of the wave's stages, so a checkpoint is only valid when
+    nothing upstream of it changed either.
+    """
+
+    VERSION = 2
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.file_hashes: dict[str, str] = {}
+
+    def file_hash(self, filename: str) -> str:
+        if filename not in self.file_hashes:
+            self.file_hashes[filename] = file_hash(filename)
+        return self.file_hashes[filename]
+
+    def keys(self, waves: list[list[Stage]]) -> list[str]:
+        # The loader code itself is an input to every stage, and the module
+        # name decides where pickle looks up the Player class.
+        key = f"{self.VERSION}:{__name__}:{self.file_hash(__file__)}"
+        ret = []
+        for wave in waves:
+            h = hashlib.sha256(key.encode())
+            for stage in wave:
+                if not stage.snapshot:
+                    continue
+                h.update(stage.name.encode())
+                for filename in stage.files:
+                    h.update(f"{filename}={self.file_hash(filename)}".encode())
+                h.update(repr(stage.params).encode())
+            key = h.hexdigest()
+            ret.append(key)
+        return ret
+
+    def path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.pickle")
+
+    def restore(self, players: PlayerLookup, stage: str, key: str) -> bool:
+        path = self.path(stage)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                if pickle.load(f) != key:
+                    return False
+                state = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable snapshot {path}: {e}")
+            return False
+        for attr in PlayerLookup.SNAPSHOT_FIELDS:
+            setattr(players, attr, state[attr])
+        return True
+
+    def save(self, players: PlayerLookup, stage: str, key: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(stage)
+        state = {attr: getattr(players, attr) for attr in PlayerLookup.SNAPSHOT_FIELDS}
+        try:
+            with open(f"{path}.tmp", "wb") as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{path}.tmp", path)
+        except Exception as e:
+            logging.warning(f"Could not write snapshot {path}: {e}")
+
+
+class StartupProfile:
+    """Wall time, CPU time, peak allocation and item counts of each load stage."""
+
+    COUNTS = ("rows", "players", "lookups", "cached", "fuzzy", "unresolved")
+
+    def __init__(self) -> None:
+        self.stages: list[dict[str, Any]] = []
+        tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Any:
+        counts = collections.Counter(LOAD_STATS)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            info: dict[str, Any] = {
+                "stage": name,
+                "wall_time": time.perf_counter() - wall,
+                "cpu_time": time.process_time() - cpu,
+                "peak_alloc": peak - base,
+            }
+            for count in self.COUNTS:
+                info[count] = LOAD_STATS[count] - counts[count]
+            info["resolved"] = info["lookups"] - info["unresolved"]
+            self.stages.append(info)
+
+    def report(self, filename: str) -> None:
+        tracemalloc.stop()
+        table = Table(title="Startup Profile")
+        table.add_column("Stage")
+        table.add_column("Wall", justify="right", style="cyan")
+        table.add_column("CPU", justify="right", style="cyan")
+        table.add_column("Peak Alloc", justify="right", style="magenta")
+        for count in self.COUNTS:
+            table.add_column(count.capitalize(), justify="right", style="green")
+        for info in self.stages:
+            table.add_row(
+                info["stage"],
+                f"{info['wall_time']:.3f}s",
+                f"{info['cpu_time']:.3f}s",
+                f"{info['peak_alloc'] / (1 << 20):.1f} MB",
+                *[str(info[count]) for count in self.COUNTS],
+            )
+        table.add_section()
+        table.add_row(
+            "Total",
+            f"{sum(info['wall_time'] for info in self.stages):.3f}s",
+            f"{sum(info['cpu_time'] for info in self.stages):.3f}s",
+            f"{max((info['peak_alloc'] for info in self.stages), default=0) / (1 << 20):.1f} MB",
+            *[str(sum(info[count] for info in self.stages)) for count in self.COUNTS],
+        )
+        Console().print(table)
+
+        with open(filename, "w") as f:
+            json.dump(
+                {
+                    "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "argv": sys.argv,
+                    "stages": self.stages,
+                },
+                f,
+                indent=4,
+            )
+        print(f"Wrote startup profile to {filename}")
+
+
 class Loader:
+    # Set by load_config
+    config: types.ModuleType
+    state_file: str
+    league_id: str
+    my_user_id: str
+    draft_id: str
+    keepers_file: str
+    picks_file: str
+    draft_file: str
+    rosters_file: str
+    users_file: str
+    draft_value_file: str
+    draft_value_file_gen: str
+    draft_settings: dict[str, Any]
+    matchups_file: str
+    players_file: str
+    projections_file: str
+    sleeper_projections_file: str
+    ol_file: str
+    def_file: str
+    injuries_file: str
+    routes_run_file: str
+    ros_file: str
+
     def load_2025_matchups(self) -> None:
         with open(self.matchups_file, "r") as f:
             j = json.loads(f.read())
-            for player, weeks in track(j.items(), description="Loading matchups"):
-                p = self.players.find(player)
+            matchups: dict[tuple[str, ...], Matchup] = {}
+            found = self.players.find_many(list(j), source="matchups")
+            for (player, weeks), p in self.track(
+                zip(j.items(), found), description="Loading matchups", total=len(j)
+            ):
                 if not p:
                     logging.info(f"Unknown player in matchups: {player}")
                     continue
                 for week in weeks:
-                    matchup = Matchup(week)
+                    key = tuple(week[1:3])
+                    matchup = matchups.get(key)
+                    if not matchup:
+                        matchup = matchups[key] = Matchup(week)
                     p.weeks.append(matchup)
-                p.calc_score()
+                self.players.table.set_weeks(p.row, [m.favor for m in p.weeks])
+            self.players.table.calc_scores(PERCENTAGE_POINTS_VAR)
 
 
     def load_sleeper(self) -> None:
@@ -890,8 +1729,9 @@ class Loader:
             ]
         )
         with open(self.players_file, "r") as f:
-            j = json.loads(f.read())
-            for idnum, info in track(j.items(), description="Loading players"):
+            # Stream the dump record by record, each inactive or non-fantasy
+            # record is dropped as soon as it is decoded.
+            for idnum, info in self.track(iter_json_items(f), description="Loading players"):
                 name = info.get("full_name", "")
                 if not name:
                     continue
@@ -918,7 +1758,9 @@ class Loader:
                 if not matched_pos:
                     continue
 
-                p = Player(PlayerName(name), info.get("team"), matched_pos, 0, 0)
+                p = Player(
+                    PlayerName(name), info.get("team"), matched_pos, table=self.players.table
+                )
                 p.age = info.get("age", 0)
                 p.weight = int(info.get("weight") or 0)
                 p.experience = info.get("years_exp", None)
@@ -1039,7 +1881,7 @@ class Loader:
             "WAS": "5A1414",
         }
 
-        for p in track(self.players.sleeper.values(), "Loading teams"):
+        for p in self.track(self.players.sleeper.values(), "Loading teams"):
             if not p.team_name:
                 continue
             team_name = p.team_name
@@ -1056,12 +1898,14 @@ class Loader:
             p.team = team
 
         with open(self.sleeper_projections_file, "r") as f:
-            reader = csv.DictReader(f)
-            for r in reader:
+            rows = [r for r in csv.DictReader(f) if r["player"] not in self.players.teams]
+            found = self.players.find_many(
+                [r["player"] for r in rows],
+                [row_hints(r, "position", "team") for r in rows],
+                "sleeper_projections",
+            )
+            for r, pl in zip(counted(rows), found):
                 name = r["player"]
-                if name in self.players.teams:
-                    continue
-                pl = self.players.find(name)
                 if not pl:
                     logging.info("Could not find %s", name)
                     continue
@@ -1070,11 +1914,10 @@ class Loader:
 
     def load_league(self) -> None:
         with self.draft.lock:
-            for pl in self.players.sleeper.values():
-                pl.fantasy_team = None
+            self.players.table.clear_fantasy_teams()
 
             with open(self.users_file, "r") as f:
-                for j in track(json.loads(f.read()), "Loading league"):
+                for j in self.track(json.loads(f.read()), "Loading league"):
                     team_name = j.get("display_name")
                     fantasy_team = FantasyTeam(team_name, j.get("user_id"),
                                                j.get("user_id") == self.my_user_id)
@@ -1084,7 +1927,7 @@ class Loader:
             self.players.fantasy_team_roster_id = {}
             with open(self.rosters_file, "r") as f:
                 j = json.loads(f.read())
-                for i, r in track(enumerate(j), "Loading rosters", total=12):
+                for i, r in self.track(enumerate(j), "Loading rosters", total=12):
                     user_id = r.get("owner_id", "0")
                     fantasy_team = self.players.fantasy_teams.get(r["owner_id"], UNKNOWN_TEAM)
                     self.players.fantasy_team_roster_id[int(r["roster_id"])] = fantasy_team
@@ -1122,14 +1965,18 @@ class Loader:
     def load_draft_values(self) -> None:
         with open(self.draft_value_file, "r") as f:
             reader = csv.DictReader(f, quotechar='"')
-            for r in reader:
-                name = r["Player"]
-                for suffix in [" Jr.", " Sr.", " III", " II"]:
-                    if name.endswith(suffix):
-                        name = name[: -len(suffix)].strip()
-                if name in self.players.teams:
-                    continue
-                p = self.players.find(name)
+            rows = [
+                r
+                for r in reader
+                if strip_name_suffix(r["Player"]) not in self.players.teams
+            ]
+            found = self.players.find_many(
+                [strip_name_suffix(r["Player"]) for r in rows],
+                [row_hints(r, "Pos", "Team") for r in rows],
+                "draft_values",
+            )
+            for r, p in zip(counted(rows), found):
+                name = strip_name_suffix(r["Player"])
                 if not p:
                     logging.info("Could not lookup %s", name)
                     continue
@@ -1146,14 +1993,18 @@ class Loader:
     def load_draft_values_gen(self) -> None:
         with open(self.draft_value_file_gen, "r") as f:
             reader = csv.DictReader(f, quotechar='"')
-            for r in reader:
-                name = r["Player"]
-                for suffix in [" Jr.", " Sr.", " III", " II"]:
-                    if name.endswith(suffix):
-                        name = name[: -len(suffix)].strip()
-                if name in self.players.teams:
-                    continue
-                p = self.players.find(name)
+            rows = [
+                r
+                for r in reader
+                if strip_name_suffix(r["Player"]) not in self.players.teams
+            ]
+            found = self.players.find_many(
+                [strip_name_suffix(r["Player"]) for r in rows],
+                [row_hints(r, "Fantasy Position", "Team") for r in rows],
+                "draft_values_gen",
+            )
+            for r, p in zip(counted(rows), found):
+                name = strip_name_suffix(r["Player"])
                 if not p:
                     logging.info("Could not lookup %s", name)
                     continue
@@ -1182,7 +2033,7 @@ class Loader:
             }.get(s, s)[0:3]
 
         with open(self.ol_file, "r") as f:
-            for line in track(f, description="Loading O-Line rankings", total=32):
+            for line in self.track(f, description="Loading O-Line rankings", total=32):
                 line = line.strip()
                 if not line:
                     continue
@@ -1199,7 +2050,7 @@ class Loader:
                 if not team.ol_ranking:
                     logging.warning("No O-Line ranking for team", team.name)
         with open(self.def_file, "r") as f:
-            for line in track(f, description="Loading defense rankings", total=32):
+            for line in self.track(f, description="Loading defense rankings", total=32):
                 line = line.strip()
                 if not line:
                     continue
@@ -1222,7 +2073,7 @@ class Loader:
             return
         with open(self.keepers_file, "r") as f:
             j = json.loads(f.read())
-            for player_id, cost in track(j.items(), "Loading keeper costs"):
+            for player_id, cost in self.track(j.items(), "Loading keeper costs"):
                 player = self.players.sleeper.get(player_id)
                 if not player:
                     logging.warning(f"Player {player_id} not found in players")
@@ -1232,12 +2083,19 @@ class Loader:
 
     def load_extra(self) -> None:
         with open(self.injuries_file, "r") as f:
-            reader = csv.DictReader(f)
-            for r in track(reader, description="Loading injury predictions", total=200):
-                match = re.match(r"([ \S]+([a-z\.]| I*))[A-Z]+ \d+$", r["player"])
+            injured = []
+            hints: list[dict[str, str]] = []
+            for r in csv.DictReader(f):
+                match = re.match(
+                    r"([ \S]+([a-z\.]| I*))([A-Z]+?)(QB|RB|WR|TE|K)? \d+$", r["player"]
+                )
                 assert match
-                name = match.group(1)
-                p = self.players.find(name)
+                injured.append((match.group(1), r))
+                hints.append({"team": match.group(3), "position": match.group(4) or ""})
+            found = self.players.find_many([name for name, _ in injured], hints, "injuries")
+            for (name, r), p in self.track(
+                zip(injured, found), description="Loading injury predictions", total=len(injured)
+            ):
                 if not p:
                     logging.info("Could not look up player for injury: %s", name)
                     continue
@@ -1249,9 +2107,13 @@ class Loader:
                 p.durability = float(r["durability"])
                 p.projected_games_missed = float(r["projected_games_missed"])
         with open(self.routes_run_file, "r") as f:
-            reader = csv.DictReader(f)
-            for r in track(reader, description="Loading first downs/route stats", total=50):
-                p = self.players.find(r["name"])
+            rows = list(csv.DictReader(f))
+            found = self.players.find_many(
+                [r["name"] for r in rows], [row_hints(r) for r in rows], "routes_run"
+            )
+            for r, p in self.track(
+                zip(rows, found), description="Loading first downs/route stats", total=len(rows)
+            ):
                 if not p:
                     logging.warning(
                         "Could not lookup player for routes run for '%s'", r["name"]
@@ -1263,21 +2125,7 @@ class Loader:
 
 
     def do_rankings(self) -> None:
-        positions = ["QB", "RB", "WR", "TE", "K"]
-        all_players = []
-        by_position = collections.defaultdict(list)
-        for p in self.players.sleeper.values():
-            all_players.append(p)
-            by_position[p.position].append(p)
-
-        all_players.sort(key=lambda p: (-p.adj_projection(), p.pos_order(), p.last_name()))
-        for i, p in enumerate(all_players):
-            p.rank = i + 1
-
-        for pos in positions:
-            by_position[pos].sort(key=lambda p: (-p.adj_projection(), p.last_name()))
-            for i, p in enumerate(by_position[pos]):
-                p.positional_rank = i + 1
+        self.players.table.rank()
 
 
     def refresh_rosters(self) -> None:
@@ -1292,7 +2140,7 @@ class Loader:
         self.draft.refresh()
 
 
-    def load_config(self, config_name) -> None:
+    def load_config(self, config_name: str) -> None:
         try:
             self.config = __import__(config_name)
         except:
@@ -1372,51 +2220,148 @@ class Loader:
         self.ros_file = OSB_ROS_FILE
 
 
-    def __init__(self, config_name, should_refresh, is_sim):
-        self.config = self.load_config(config_name)
+    def __init__(self, config_name, should_refresh, is_sim, use_snapshot=True, profile=None):
+        self.load_config(config_name)
         self.players = PlayerLookup()
         self.draft = Draft(self.players,
                            self.draft_id, self.draft_file, self.picks_file, self.keepers_file)
         self.local_state = LocalState(self.players, self.draft, self.state_file)
         self.should_refresh = should_refresh
         self.is_sim = is_sim
+        self.snapshot = Snapshot(SNAPSHOT_DIR) if use_snapshot else None
+        self.progress: Progress | None = None
+        self.stage_times: dict[str, float] = {}
+        self.profile: StartupProfile | None = profile
 
 
-    def load(self):
-        if self.should_refresh:
-            self.download_nfl_players()
-
-        self.load_sleeper()
-        self.load_draft_values()
-        self.local_state.load()
+    def profiled(self, name: str) -> Any:
+        if self.profile:
+            return self.profile.stage(name)
+        return contextlib.nullcontext()
 
-        # TODO
-        self.load_draft_values_gen()
 
-        self.load_ol_def_rankings()
-        self.load_keeper_costs()
-        self.load_extra()
+    def track(self, sequence: Any, description: str, total: float | None = None) -> Any:
+        if total is None:
+            total = operator.length_hint(sequence) or None
+        if self.progress:
+            return self.progress.track(counted(sequence), total=total, description=description)
+        return track(counted(sequence), description=description, total=total)
 
-        self.load_2025_matchups()
-        self.do_rankings()
 
+    def stages(self) -> list[Stage]:
+        """Load stages and the stages each one needs to have run first."""
+        stages = []
+        downloads: list[str] = []
+        rosters: list[str] = []
         if self.should_refresh:
-            self.refresh_rosters()
-        self.load_league()
+            stages += [
+                Stage("download_players", self.download_nfl_players, snapshot=False),
+                Stage("refresh_rosters", self.refresh_rosters, snapshot=False),
+            ]
+            downloads = ["download_players"]
+            rosters = ["refresh_rosters"]
+
+        return stages + [
+            Stage("name_cache", self.load_name_cache, downloads, snapshot=False),
+            Stage("sleeper", self.load_sleeper, downloads + ["name_cache"],
+                  [self.players_file, self.sleeper_projections_file]),
+            Stage("draft_values", self.load_draft_values, ["sleeper"],
+                  [self.draft_value_file]),
+            # TODO
+            Stage("draft_values_gen", self.load_draft_values_gen, ["draft_values"],
+                  [self.draft_value_file_gen]),
+            Stage("ol_def_rankings", self.load_ol_def_rankings, ["sleeper"],
+                  [self.ol_file, self.def_file]),
+            Stage("keeper_costs", self.load_keeper_costs, ["sleeper"],
+                  [self.keepers_file]),
+            Stage("extra", self.load_extra, ["sleeper"],
+                  [self.injuries_file, self.routes_run_file]),
+            Stage("matchups", self.load_2025_matchups, ["draft_values_gen", "extra"],
+                  [self.matchups_file], [PERCENTAGE_POINTS_VAR]),
+            Stage("rankings", self.do_rankings, ["matchups", "draft_values_gen", "extra"]),
+            # Local state and the league assign fantasy teams, which are not
+            # part of the snapshot, so they run after every snapshot stage.
+            Stage("local_state", self.local_state.load, ["rankings"],
+                  snapshot=False),
+            Stage("league", self.load_league,
+                  ["local_state", "keeper_costs", "draft_values_gen"] + rosters,
+                  snapshot=False),
+        ]
+
+
+    def run_stage(self, stage: Stage) -> None:
+        start = time.perf_counter()
+        with self.profiled(stage.name):
+            stage.fn()
+        self.stage_times[stage.name] = time.perf_counter() - start
+        logging.info(f"Stage {stage.name} took {self.stage_times[stage.name]:.3f}s")
+
+
+    def run_stages(self, stages: list[Stage]) -> None:
+        waves = stage_waves(stages)
+        keys: list[str] | None = None
+        # Snapshot stages in waves up to this one were restored from a snapshot.
+        restored = -1
+
+        # Profiled stages run one at a time so their CPU time and allocations
+        # aren't mixed up with other stages. Tracing allocations also slows
+        # everything down, so compare profiles with each other rather than
+        # with normal startup times.
+        workers = 1 if self.profile else LOAD_WORKERS
+        with Progress() as self.progress, ThreadPoolExecutor(workers) as pool:
+            for i, wave in enumerate(waves):
+                has_snapshot = any(stage.snapshot for stage in wave)
+                # Files downloaded by earlier waves are inputs, so the
+                # snapshot is only looked up right before it is first needed.
+                if self.snapshot and has_snapshot and keys is None:
+                    with self.profiled("snapshot restore"):
+                        keys = self.snapshot.keys(waves)
+                        for j in reversed(range(i, len(waves))):
+                            name = "+".join(stage.name for stage in waves[j])
+                            if self.snapshot.restore(self.players, name, keys[j]):
+                                logging.info(f"Restored snapshot after stages {name}")
+                                restored = j
+                                break
+
+                to_run = [stage for stage in wave if not stage.snapshot or i > restored]
+                futures = [pool.submit(self.run_stage, stage) for stage in to_run]
+                for future in futures:
+                    future.result()
+
+                if self.snapshot and keys and has_snapshot and i > restored:
+                    name = "+".join(stage.name for stage in wave)
+                    with self.profiled(f"snapshot save {i}"):
+                        self.snapshot.save(self.players, name, keys[i])
+        self.progress = None
+
+
+    def load_name_cache(self) -> None:
+        # Share the snapshot's hash of the players file rather than reading it twice.
+        hasher = self.snapshot.file_hash if self.snapshot else file_hash
+        self.players.load_resolutions(RESOLUTIONS_FILE, hasher(self.players_file))
+
+
+    def load(self):
+        self.run_stages(self.stages())
+        self.players.save_resolutions()
 
         if self.draft_id and PRE_DRAFT:
-            if self.should_refresh:
-                self.draft.refresh()
-                self.draft.start()
-            elif self.is_sim:
-                REFRESH_RATE = 5
-                self.draft.start_sim()
-            else:
-                self.draft.load()
+            with self.profiled("draft"):
+                if self.should_refresh:
+                    self.draft.refresh()
+                    self.draft.start()
+                elif self.is_sim:
+                    REFRESH_RATE = 5
+                    self.draft.start_sim()
+                else:
+                    self.draft.load()
 
 def load(args):
-    l = Loader(args.config, args.refresh, args.sim)
+    profile = StartupProfile() if args.profile_startup else None
+    l = Loader(args.config, args.refresh, args.sim, args.snapshot, profile)
     l.load()
+    if profile:
+        profile.report(args.profile_startup)
     return l.players
 
 def parse_args() -> argparse.Namespace:
@@ -1428,6 +2373,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("-v", "--verbose", dest="verbose", action="store_true")
     parser.add_argument("--max-age", dest="max_age", type=int, default=100)
     parser.add_argument("--refresh", dest="refresh", action="store_true")
+    parser.add_argument("--no-snapshot", dest="snapshot", action="store_false")
+    parser.add_argument(
+        "--profile-startup",
+        dest="profile_startup",
+        nargs="?",
+        const=PROFILE_FILE,
+        help=f"Time each load stage and write the results to a JSON file"
+        f" (default {PROFILE_FILE})",
+    )
     global VERBOSE, MAX_AGE
     args = parser.parse_args()
     VERBOSE = args.verbose
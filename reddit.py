@@ -17,3 +17,6 @@ DRAFT_SETTINGS = {
     "WR": [3, 4],
     "TE": [1, 2],
 }
+
+# Starting lineup, 1 DEF aside
+LINEUP = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 2, "SF": 1}
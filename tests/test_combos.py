@@ -0,0 +1,212 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import ff
+from players import PlayerName, PlayerTable
+
+
+def naive_score(fppgs: np.ndarray, rows: tuple[int, ...], n: int) -> float:
+    """A combo's score the slow way: its best n each week, then its best weeks."""
+    weeks = [sum(sorted(fppgs[list(rows), i], reverse=True)[:n]) for i in range(fppgs.shape[1])]
+    return sum(sorted(weeks, reverse=True)[: ff.COMBOS_MAX_WEEK])
+
+
+def random_fppgs(num_players: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # A spread of players, each with their own ups and downs
+    means = rng.uniform(2, 20, num_players)
+    fppgs = means[:, None] * rng.gamma(4, 0.25, (num_players, ff.COMBOS_NUM_GAMES))
+    # Best first, as do_combo() orders candidates
+    return fppgs[np.argsort(-fppgs.sum(axis=1), kind="stable")]
+
+
+@pytest.mark.parametrize("max_week", [ff.COMBOS_MAX_WEEK, 7])
+@pytest.mark.parametrize("k", [1, 2, 3, 4, 5, 6])
+def test_score_combos_matches_naive_score(monkeypatch, k, max_week):
+    monkeypatch.setattr(ff, "COMBOS_MAX_WEEK", max_week)
+    fppgs = random_fppgs(9, k)
+    combos = np.array(list(itertools.combinations(range(9), k)), dtype=np.intp)
+    for n in range(1, k + 2):
+        np.testing.assert_allclose(
+            ff.score_combos(fppgs, combos, n),
+            [naive_score(fppgs, tuple(rows), n) for rows in combos],
+            rtol=0,
+            atol=1e-9,
+        )
+
+
+def make_pool(num_players: int, seed: int) -> list[ff.Player]:
+    table = PlayerTable()
+    fppgs = random_fppgs(num_players, seed)
+    pool = []
+    for i in range(num_players):
+        p = ff.Player(PlayerName(f"Player {i}"), "KC", "RB", table=table)
+        p.sleeper_id = str(i)
+        p.weeks = [None] * 18
+        p.injury_status = None
+        pool.append(p)
+    table.columns["week_fppgs"][: len(pool), : ff.COMBOS_NUM_GAMES] = fppgs
+    return pool
+
+
+def test_do_combo_scores_every_combo():
+    pool = make_pool(12, 2)
+    picked, available = pool[:1], pool[1:]
+    n, m = 4, 2
+    combos = ff.do_combo(picked, available, n, m, None).combos
+
+    fppgs = np.array([p.week_fppgs[: ff.COMBOS_NUM_GAMES] for p in pool])
+    expected = sorted(
+        naive_score(fppgs, (0, *rows), m)
+        for rows in itertools.combinations(range(1, len(pool)), n - 1)
+    )
+    np.testing.assert_allclose([score for _, score, _ in combos], expected, rtol=0, atol=1e-9)
+    for players, score, num_play in combos:
+        assert picked[0] in players and num_play == m
+        rows = tuple(pool.index(p) for p in players)
+        assert score == pytest.approx(naive_score(fppgs, rows, m), abs=1e-9)
+
+
+def brute_force(fppgs: np.ndarray, num_candidates: int, slots: int, n: int) -> np.ndarray:
+    """Every combo's score, scoring them all, best last."""
+    picked = list(range(num_candidates, len(fppgs)))
+    combos = np.array(
+        [list(c) + picked for c in itertools.combinations(range(num_candidates), slots)],
+        dtype=np.intp,
+    )
+    return np.sort(ff.score_combos(fppgs, combos, n))
+
+
+@pytest.mark.parametrize(
+    "num_players, num_picked, n, m, top_k",
+    [
+        (20, 0, 4, 2, 15),
+        (20, 0, 1, 1, 3),
+        (16, 2, 5, 3, 10),
+        (30, 1, 3, 2, 1),
+        (12, 0, 5, 3, None),
+    ],
+)
+def test_do_combo_matches_brute_force(num_players, num_picked, n, m, top_k):
+    pool = make_pool(num_players, num_players + n)
+    picked, available = pool[:num_picked], pool[num_picked:]
+    combos = ff.do_combo(picked, available, n, m, top_k).combos
+
+    fppgs = np.array([p.week_fppgs[: ff.COMBOS_NUM_GAMES] for p in available + picked])
+    expected = brute_force(fppgs, len(available), n - num_picked, m)
+    if top_k is not None:
+        expected = expected[-top_k:]
+    np.testing.assert_allclose([score for _, score, _ in combos], expected, rtol=0, atol=1e-9)
+    rows = {p.sleeper_id: i for i, p in enumerate(available + picked)}
+    for players, score, _ in combos:
+        assert set(picked) <= set(players)
+        combo = np.array([[rows[p.sleeper_id] for p in players]], dtype=np.intp)
+        assert ff.score_combos(fppgs, combo, m)[0] == pytest.approx(score, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "num_candidates, num_picked, slots, n, top_k",
+    [
+        (14, 0, 4, 2, 15),
+        (14, 0, 1, 1, 3),
+        (12, 2, 3, 3, 10),
+        (10, 0, 5, 3, None),
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_finds_top_combos(monkeypatch, num_candidates, num_picked, slots, n, top_k, workers):
+    # Hand every lead but the first to the process pool
+    monkeypatch.setattr(ff, "COMBOS_WORKERS", workers)
+    monkeypatch.setattr(ff, "COMBOS_SERIAL_SECONDS", 0)
+    candidates = random_fppgs(num_candidates, num_candidates * 10 + slots)
+    fppgs = np.vstack([candidates, random_fppgs(num_picked, 1)])
+    search = ff.ComboSearch(fppgs, num_candidates, slots, n, top_k)
+    ff.run_combo_search(search)
+
+    expected = brute_force(fppgs, num_candidates, slots, n)
+    if top_k is not None:
+        expected = expected[-top_k:]
+    found = sorted(search.best)
+    np.testing.assert_allclose([score for score, _ in found], expected, rtol=0, atol=1e-9)
+    for score, rows in found:
+        assert rows[len(rows) - num_picked :] == list(range(num_candidates, len(fppgs)))
+        combo = np.array([rows], dtype=np.intp)
+        assert ff.score_combos(fppgs, combo, n)[0] == pytest.approx(score, abs=1e-9)
+
+
+def test_undominated_keeps_players_beaten_by_too_few():
+    fppgs = np.array([
+        [5.0, 5.0, 5.0],
+        [4.0, 6.0, 4.0],
+        [3.0, 3.0, 3.0],
+        [0.0, 9.0, 0.0],
+        [1.0, 1.0, 1.0],
+    ])
+    # [3, 3, 3] is matched or beaten every week by 2 others, [1, 1, 1] by 3
+    assert list(ff.undominated(fppgs, 2)) == [0, 1, 3]
+    assert list(ff.undominated(fppgs, 3)) == [0, 1, 2, 3]
+    assert list(ff.undominated(fppgs, 4)) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 100, 1000])
+def test_do_combo_keeps_top_k(top_k):
+    pool = make_pool(14, 5)
+    n, m = 4, 2
+    every = ff.do_combo([], pool, n, m, None).combos
+    best = ff.do_combo([], pool, n, m, top_k).combos
+    assert [(ps, score) for ps, score, _ in best] == [
+        (ps, score) for ps, score, _ in every[-top_k:]
+    ]
+
+
+def assert_same_combos(got: ff.KnownCombos, fresh: ff.KnownCombos) -> None:
+    np.testing.assert_allclose(
+        [score for _, score, _ in got.combos],
+        [score for _, score, _ in fresh.combos],
+        rtol=0,
+        atol=1e-9,
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_known_combos_match_fresh_search(monkeypatch, workers):
+    monkeypatch.setattr(ff, "COMBOS_WORKERS", workers)
+    monkeypatch.setattr(ff, "COMBOS_SERIAL_SECONDS", 0)
+    pool = make_pool(16, 3)
+    n, m, top_k = 5, 3, 25
+    known = ff.do_combo([], pool, n, m, top_k)
+    assert len(known.combos) == top_k
+
+    # Another team takes the best player of the best combo
+    best = known.combos[-1][0]
+    available = [p for p in pool if p is not best[0]]
+    got = ff.do_combo([], available, n, m, top_k, known)
+    assert_same_combos(got, ff.do_combo([], available, n, m, top_k))
+
+    # I take someone from the middle of them
+    mine = got.combos[len(got.combos) // 2][0][-1]
+    available = [p for p in available if p is not mine]
+    got = ff.do_combo([mine], available, n, m, top_k, got)
+    assert_same_combos(got, ff.do_combo([mine], available, n, m, top_k))
+
+    # A different top_k reuses the same combos
+    for other_top_k in (5, 60):
+        assert_same_combos(
+            ff.do_combo([mine], available, n, m, other_top_k, got),
+            ff.do_combo([mine], available, n, m, other_top_k),
+        )
+
+
+def test_known_combos_dropped_when_fppgs_change():
+    pool = make_pool(14, 4)
+    n, m, top_k = 4, 2, 20
+    known = ff.do_combo([], pool, n, m, top_k)
+
+    # The worst player in the kept combos becomes the best
+    p = min((p for ps, _, _ in known.combos for p in ps), key=lambda p: p.week_fppgs.sum())
+    p.table.columns["week_fppgs"][p.row] *= 3
+    assert_same_combos(
+        ff.do_combo([], pool, n, m, top_k, known), ff.do_combo([], pool, n, m, top_k)
+    )
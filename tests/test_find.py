@@ -0,0 +1,59 @@
+import pytest
+
+import players
+
+from test_names import make_lookup
+
+NAMES = [
+    "Patrick Mahomes", "Travis Kelce", "Ja'Marr Chase", "Justin Jefferson",
+    "Bijan Robinson", "Christian McCaffrey", "CeeDee Lamb", "Amon-Ra St. Brown",
+]
+
+
+def test_find_many_matches_find():
+    tokens = [
+        "Patrick Mahomes", "Pat Mahomes II", "Travis Kelsey", "JaMarr Chase Jr.",
+        "Justin Jeferson", "Bijan Robinson", "C. McCaffrey", "Ceedee Lamb",
+        "Amon Ra St Brown", "Nobody At All", "KC",
+    ]
+    one = make_lookup(*NAMES)
+    one.teams["KC"] = players.Team("KC", "Kansas City Chiefs", "", "red")
+    expected = [one.find(token, "a") for token in tokens]
+
+    many = make_lookup(*NAMES)
+    many.teams["KC"] = players.Team("KC", "Kansas City Chiefs", "", "red")
+    got = many.find_many(tokens, source="a")
+    assert [p and p.sleeper_id for p in got] == [p and p.sleeper_id for p in expected]
+    assert many.resolutions == one.resolutions
+
+
+def test_find_many_prefers_hinted_position():
+    lookup = make_lookup("Mike Williams", "Mike Williamson")
+    lookup.sleeper["2"].position = "TE"
+    got = lookup.find_many(
+        ["Mike Williams", "Mike Williamsen", "Mike Williamsen"],
+        [{"position": "TE"}, {"position": "TE"}, {"position": "WR"}],
+    )
+    # Exact names win over hints, fuzzy matches are narrowed by position first
+    assert [p and p.sleeper_id for p in got] == ["1", "2", "1"]
+
+
+def test_find_by_ids():
+    lookup = make_lookup(*NAMES)
+    lookup.sleeper["1"].espn_id = "3139477"
+    lookup.add(lookup.sleeper["1"])
+    lookup.sleeper["2"].gsis_id = "00-0030506"
+    lookup.add(lookup.sleeper["2"])
+
+    assert lookup.find_by("espn", 3139477) is lookup.sleeper["1"]
+    assert lookup.find_by("espn", "1") is None
+    assert lookup.find_by_ids({"espn": "3139477"}) is lookup.sleeper["1"]
+    assert lookup.find_by_ids({"espn": "999", "gsis": "00-0030506"}) is lookup.sleeper["2"]
+    assert lookup.find_by_ids({"position": "QB", "espn": ""}) is None
+    with pytest.raises(ValueError):
+        lookup.find_by("sleeper", "1")
+
+    # Ids win over names, which may be spelled or even attributed differently
+    hints = [players.row_hints({"espn_id": "3139477"}), players.row_hints({"espn_id": "0"})]
+    got = lookup.find_many(["Travis Kelce", "Travis Kelce"], hints)
+    assert [p.sleeper_id for p in got] == ["1", "2"]
@@ -0,0 +1,46 @@
+import io
+import json
+import os
+
+import pytest
+
+import players
+
+DOC = {
+    "1": {"name": "A \"quoted\" name", "nested": {"list": [1, 2.5, None, True]}},
+    "two": [],
+    "3": "string with , and : and } inside",
+    "unié": {"x": "☃"},
+    "5": 0,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("text", [
+    json.dumps(DOC),
+    json.dumps(DOC, indent=4),
+    json.dumps(DOC, ensure_ascii=False),
+    "{}",
+    "  { }  ",
+])
+def test_iter_json_items_matches_json_load(text, chunk_size):
+    items = list(players.iter_json_items(io.StringIO(text), chunk_size))
+    assert dict(items) == json.loads(text)
+    assert [k for k, _ in items] == list(json.loads(text))
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"a": 1', '{"a" 1}', '{"a": 1,}'])
+def test_iter_json_items_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        list(players.iter_json_items(io.StringIO(text), 2))
+
+
+def test_iter_json_items_matches_players_file():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        players.PLAYERS_FILE)
+    if not os.path.exists(path):
+        pytest.skip("needs the sleeper players dump, see --refresh")
+    with open(path) as f:
+        expected = json.load(f)
+    with open(path) as f:
+        assert dict(players.iter_json_items(f)) == expected
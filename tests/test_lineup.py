@@ -0,0 +1,94 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import ff
+from players import PlayerName, PlayerTable
+
+SUPERFLEX = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 2, "SF": 1}
+
+
+def brute_force_week(roster: list[tuple[str, float]], lineup: dict[str, int]) -> float:
+    """The best lineup of roster by trying every assignment of players to slots."""
+    slots = [
+        ff.FLEX_POSITIONS.get(slot, frozenset([slot]))
+        for slot, num in lineup.items()
+        for _ in range(num)
+    ]
+    # Empty slots are allowed, as a short roster leaves some open
+    players = roster + [("", 0.0)] * len(slots)
+    best = 0.0
+    for chosen in itertools.permutations(range(len(players)), len(slots)):
+        if all(not players[i][0] or players[i][0] in slot for i, slot in zip(chosen, slots)):
+            best = max(best, sum(players[i][1] for i in chosen))
+    return best
+
+
+@pytest.mark.parametrize(
+    "lineup",
+    [
+        SUPERFLEX,
+        {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1},
+        {"QB": 1, "RB": 1, "WR": 1, "TE": 1, "SF": 2},
+        {"QB": 2, "RB": 2, "WR": 2, "TE": 1},
+    ],
+)
+def test_lineup_weekly_matches_brute_force(monkeypatch, lineup):
+    monkeypatch.setattr(ff, "LINEUP", lineup)
+    rng = np.random.default_rng(len(lineup))
+    num_rosters, num_weeks = 20, 3
+    counts = {"QB": 2, "RB": 3, "WR": 3, "TE": 2}
+    points = {pos: rng.uniform(0, 30, (num, num_rosters, num_weeks)) for pos, num in counts.items()}
+    # Some rosters are short at a position
+    points["TE"][1, :5] = 0.0
+
+    weekly = ff.lineup_weekly(points)
+    for r in range(num_rosters):
+        for w in range(num_weeks):
+            roster = [
+                (pos, ps[i, r, w]) for pos, ps in points.items() for i in range(len(ps))
+            ]
+            assert weekly[r, w] == pytest.approx(brute_force_week(roster, lineup))
+
+
+def test_lineup_additions_rank_by_gain(monkeypatch):
+    monkeypatch.setattr(ff, "LINEUP", SUPERFLEX)
+    table = PlayerTable()
+    rng = np.random.default_rng(1)
+
+    def make(position: str, mean: float) -> ff.Player:
+        p = ff.Player(PlayerName(f"{position} {len(table)}"), "KC", position, table=table)
+        p.weeks = [None] * 18
+        p.injury_status = None
+        p.table.columns["week_fppgs"][p.row, : ff.COMBOS_NUM_GAMES] = rng.uniform(
+            0, 2 * mean, ff.COMBOS_NUM_GAMES
+        )
+        return p
+
+    roster = [make("QB", 20), make("RB", 12), make("WR", 12), make("TE", 8)]
+    available = [make(pos, mean) for pos in ("QB", "RB", "WR", "TE") for mean in (5, 15)]
+    additions = ff.lineup_additions(roster, available)
+
+    def score(ps: list[ff.Player]) -> float:
+        points = {
+            pos: np.array([p.week_fppgs[: ff.COMBOS_NUM_GAMES] for p in ps if p.position == pos])
+            .reshape(-1, 1, ff.COMBOS_NUM_GAMES)
+            for pos in ("QB", "RB", "WR", "TE")
+        }
+        return ff.score_weeks(ff.lineup_weekly(points)).item()
+
+    base = score(roster)
+    expected = sorted(((p, score(roster + [p]) - base) for p in available), key=lambda a: -a[1])
+    assert [p for p, _ in additions] == [p for p, _ in expected]
+    np.testing.assert_allclose([g for _, g in additions], [g for _, g in expected], atol=1e-9)
+    assert all(gain > 0 for _, gain in additions)
+
+
+@pytest.mark.parametrize("config", ["reddit", "theboys"])
+def test_superflex_configs_rank_lineup_additions(config):
+    module = __import__(config)
+    assert module.LINEUP.get("SF")
+    assert sum(module.LINEUP.get(pos, 0) for pos in module.DRAFT_SETTINGS) + sum(
+        module.LINEUP.get(slot, 0) for slot in ff.FLEX_POSITIONS
+    ) == sum(start for start, _ in module.DRAFT_SETTINGS.values())
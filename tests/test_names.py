@@ -0,0 +1,66 @@
+import pytest
+
+import players
+
+
+@pytest.mark.parametrize("name, normalized", [
+    ("Patrick Mahomes", "patrick mahomes"),
+    ("D.J. Moore", "dj moore"),
+    ("D. J. Moore", "dj moore"),
+    ("DJ Moore", "dj moore"),
+    ("Michael Pittman Jr.", "michael pittman"),
+    ("Marvin Harrison Jr", "marvin harrison"),
+    ("Kenneth Walker III", "kenneth walker"),
+    ("Ja'Marr Chase", "jamarr chase"),
+    ("Amon-Ra St. Brown", "amon ra st brown"),
+    ("Marquise Brown", "hollywood brown"),
+    ("Gabe Davis", "gabriel davis"),
+    ("Juju Smith-Schuster", "juju smith schuster"),
+    ("Ricky Pearsall", "ricky pearsall"),
+    ("Zoë Émile", "zoe emile"),
+    ("V", "v"),
+])
+def test_normalize_name(name, normalized):
+    assert players.normalize_name(name) == normalized
+
+
+def make_lookup(*names: str) -> players.PlayerLookup:
+    lookup = players.PlayerLookup()
+    for i, name in enumerate(names):
+        p = players.Player(players.PlayerName(name), "KC", "WR", i + 1, i + 1)
+        p.sleeper_id = str(i + 1)
+        lookup.add(p)
+    return lookup
+
+
+def test_find_resolves_spellings_without_fuzzy_matching():
+    lookup = make_lookup("DJ Moore", "Hollywood Brown", "Michael Pittman", "Amon-Ra St. Brown")
+    fuzzy = players.LOAD_STATS["fuzzy"]
+    assert lookup.find("D.J. Moore") is lookup.sleeper["1"]
+    assert lookup.find("Marquise Brown") is lookup.sleeper["2"]
+    assert lookup.find("Michael Pittman Jr.") is lookup.sleeper["3"]
+    assert lookup.find("Amon-Ra St Brown") is lookup.sleeper["4"]
+    assert players.LOAD_STATS["fuzzy"] == fuzzy
+
+
+def test_resolutions_persist_across_runs(tmp_path):
+    filename = str(tmp_path / "resolutions.json")
+    lookup = make_lookup("Patrick Mahomes", "Travis Kelce")
+    lookup.load_resolutions(filename, "hash")
+    assert lookup.find("Pat Mahomes II", "rankings") is lookup.sleeper["1"]
+    assert lookup.find("Nobody At All", "rankings") is None
+    lookup.save_resolutions()
+
+    lookup = make_lookup("Patrick Mahomes", "Travis Kelce")
+    lookup.load_resolutions(filename, "hash")
+    fuzzy = players.LOAD_STATS["fuzzy"]
+    assert lookup.find("Pat Mahomes II", "rankings") is lookup.sleeper["1"]
+    assert lookup.find("Nobody At All", "rankings") is None
+    assert players.LOAD_STATS["fuzzy"] == fuzzy
+
+    # Resolutions are per source and dropped when the players file changes
+    lookup.find("Pat Mahomes II", "matchups")
+    assert players.LOAD_STATS["fuzzy"] == fuzzy + 1
+    lookup = make_lookup("Patrick Mahomes", "Travis Kelce")
+    lookup.load_resolutions(filename, "other hash")
+    assert lookup.resolutions == {}
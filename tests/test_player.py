@@ -0,0 +1,91 @@
+import pickle
+
+import pytest
+
+import players
+
+
+def make_player() -> players.Player:
+    return players.Player(players.PlayerName("Travis Kelce"), "KC", "TE", 1, 1)
+
+
+def test_player_info_only_allocated_when_set():
+    p = make_player()
+    assert p.info is None
+    assert (p.height, p.experience, p.espn_id, p.injury_status) == (0, None, "", "")
+
+    # None means missing from the players file and reads back as the default
+    p.college = None
+    p.espn_id = ""
+    assert p.info is None
+
+    p.espn_id = "15847"
+    p.college = None
+    assert p.info == players.PlayerInfo(espn_id="15847")
+    assert (p.espn_id, p.college) == ("15847", "")
+
+
+def test_player_is_slotted():
+    p = make_player()
+    with pytest.raises(AttributeError):
+        p.not_a_field = 1  # type: ignore[attr-defined]
+
+
+def test_player_pickles_with_info():
+    p = make_player()
+    p.weight = 250
+    p.notes.append("note")
+    q = pickle.loads(pickle.dumps(p))
+    assert (q.name, q.weight, q.info, q.notes) == (p.name, 250, p.info, ["note"])
+
+
+def test_adopt_moves_row_and_frees_old_one():
+    detached = len(players.DETACHED_TABLE)
+    made = [
+        players.Player(players.PlayerName(f"Player {i}"), "KC", "RB", i, i) for i in range(3)
+    ]
+    for i, p in enumerate(made):
+        p.projection = 100.0 + i
+        p.keeper_cost = i
+    assert len(players.DETACHED_TABLE) == detached + 3
+
+    table = players.PlayerTable()
+    table.adopt(made[0])
+    assert len(players.DETACHED_TABLE) == detached + 2
+    assert made[0].table is table and table.players == [made[0]]
+    # The last detached row moved into the freed one
+    for i, p in enumerate(made):
+        assert p.table.players[p.row] is p
+        assert (p.projection, p.keeper_cost, p.position) == (100.0 + i, i, "RB")
+
+    table.adopt(made[2])
+    table.adopt(made[1])
+    assert len(players.DETACHED_TABLE) == detached
+    assert [p.projection for p in table.players] == [100.0, 102.0, 101.0]
+
+    # Freed rows are reset for the next Player
+    p = players.Player(players.PlayerName("Fresh"), "KC", "WR", 0, 0)
+    assert (p.projection, p.adp, p.keeper_cost) == (0.0, 1000.0, 0)
+    table.adopt(p)
+
+
+def test_lookup_adopts_detached_players():
+    detached = len(players.DETACHED_TABLE)
+    lookup = players.PlayerLookup()
+    for i in range(100):
+        p = players.Player(players.PlayerName(f"Player {i}"), "KC", "WR", i, i)
+        p.sleeper_id = str(i)
+        lookup.add(p)
+    assert len(players.DETACHED_TABLE) == detached
+    assert len(lookup.table) == 100
+    assert lookup.table.players == list(lookup.sleeper.values())
+
+
+def test_integer_columns_refuse_fractions():
+    p = make_player()
+    p.keeper_cost = 12.0
+    assert p.keeper_cost == 12
+    with pytest.raises(ValueError):
+        p.keeper_cost = 12.5
+    p.keeper_cost = None
+    assert p.keeper_cost == 0
@@ -0,0 +1,37 @@
+import json
+import threading
+
+import players
+
+
+def test_count_load_from_threads():
+    before = players.LOAD_STATS["rows"]
+
+    def work() -> None:
+        for _ in players.counted(range(10000)):
+            pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert players.LOAD_STATS["rows"] - before == 80000
+
+
+def test_startup_profile_counts_each_stage(tmp_path):
+    profile = players.StartupProfile()
+    with profile.stage("first"):
+        list(players.counted(range(3)))
+        players.count_load("lookups", 5)
+        players.count_load("unresolved")
+    with profile.stage("second"):
+        players.count_load("players", 2)
+    profile.report(str(tmp_path / "profile.json"))
+
+    first, second = profile.stages
+    assert (first["stage"], first["rows"], first["lookups"], first["resolved"]) == \
+        ("first", 3, 5, 4)
+    assert (second["stage"], second["rows"], second["players"]) == ("second", 0, 2)
+    with open(tmp_path / "profile.json") as f:
+        assert json.load(f)["stages"] == profile.stages
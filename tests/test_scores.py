@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+import players
+
+
+def calc_score(projection: float, favors: list[int], var: float) -> list[float]:
+    """The per-player projection calc_scores replaced."""
+    vari = projection * var
+    fixed = (projection - vari) / (len(favors) - 1)
+    points_per_star = vari / sum(favors)
+    return [0.0 if f == 0 else fixed + points_per_star * f for f in favors]
+
+
+@pytest.mark.parametrize("var", [0.3, 0.5])
+def test_calc_scores_matches_per_player_scores(var):
+    rng = random.Random(var)
+    table = players.PlayerTable()
+    expected = []
+    for i in range(200):
+        p = players.Player(players.PlayerName(f"Player {i}"), "KC", "WR", i, i, table=table)
+        p.projection = rng.uniform(0, 300)
+        p.projected_games_missed = rng.choice([0.0, 1.5, 4.0])
+        favors = [rng.randint(1, 5) for _ in range(17)]
+        favors[rng.randrange(17)] = 0
+        table.set_weeks(p.row, favors)
+        expected.append(calc_score(p.adj_projection(), favors, var))
+    table.calc_scores(var)
+
+    for p, weeks in zip(table.players, expected):
+        assert list(p.week_fppgs[:17]) == pytest.approx(weeks)
+        assert p.week_fppgs[:17].sum() == pytest.approx(p.adj_projection())
+
+
+def test_week_columns_move_with_adopt():
+    made = [players.Player(players.PlayerName(f"Player {i}"), "KC", "WR", i, i) for i in range(3)]
+    for i, p in enumerate(made):
+        p.projection = 170.0 * (i + 1)
+        p.table.set_weeks(p.row, [i + 1] * 17)
+    table = players.PlayerTable()
+    for p in made:
+        table.adopt(p)
+    table.calc_scores(0.3)
+    for i, p in enumerate(made):
+        assert list(p.week_fppgs[:17]) == pytest.approx(calc_score(p.projection, [i + 1] * 17, 0.3))
+    assert list(table.column("favor")[:, 0]) == [1, 2, 3]
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+import players
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists(os.path.join(REPO, players.PLAYERS_FILE)),
+    reason="needs the sleeper players dump, see --refresh")
+
+
+@pytest.fixture
+def load(monkeypatch, tmp_path):
+    monkeypatch.chdir(REPO)
+    monkeypatch.setattr(players, "SNAPSHOT_DIR", str(tmp_path))
+
+    def load(*argv: str) -> dict:
+        monkeypatch.setattr(sys, "argv", ["players.py", *argv])
+        return state(players.load(players.parse_args()))
+    return load
+
+
+def state(lookup: players.PlayerLookup) -> dict:
+    return {
+        sleeper_id: (p.name.unf, p.position, p.rank, p.positional_rank, p.projection,
+                     p.adp, p.draft_value, p.keeper_cost,
+                     p.fantasy_team.name if p.fantasy_team else None,
+                     [p.week_fppg(i) for i in range(len(p.weeks))])
+        for sleeper_id, p in lookup.sleeper.items()
+    }
+
+
+def test_snapshot_restore_matches_cold_load(load, tmp_path):
+    cold = load("--no-snapshot")
+    assert not os.listdir(tmp_path)
+
+    assert load() == cold
+    assert os.listdir(tmp_path)
+    assert load() == cold
+
+
+def test_changed_setting_invalidates_later_stages(load, monkeypatch):
+    before = load()
+    monkeypatch.setattr(players, "PERCENTAGE_POINTS_VAR", 0.5)
+    cold = load("--no-snapshot")
+    assert cold != before
+
+    assert load() == cold
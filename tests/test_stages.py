@@ -0,0 +1,39 @@
+import pytest
+
+import players
+
+
+def stage(name: str, *deps: str) -> players.Stage:
+    return players.Stage(name, lambda: None, list(deps))
+
+
+def names(waves: list[list[players.Stage]]) -> list[list[str]]:
+    return [[s.name for s in wave] for wave in waves]
+
+
+def test_stage_waves_groups_independent_stages():
+    waves = players.stage_waves([
+        stage("sleeper"),
+        stage("draft_values", "sleeper"),
+        stage("keeper_costs", "sleeper"),
+        stage("matchups", "sleeper"),
+        stage("rankings", "draft_values", "matchups"),
+        stage("league"),
+    ])
+    assert names(waves) == [
+        ["sleeper", "league"],
+        ["draft_values", "keeper_costs", "matchups"],
+        ["rankings"],
+    ]
+
+
+def test_stage_waves_runs_stages_after_their_deps():
+    waves = players.stage_waves([
+        stage("a"), stage("b", "a"), stage("c", "b"), stage("d", "a", "c"),
+    ])
+    assert names(waves) == [["a"], ["b"], ["c"], ["d"]]
+
+
+def test_stage_waves_rejects_unknown_deps():
+    with pytest.raises(RuntimeError):
+        players.stage_waves([stage("b", "a"), stage("a")])
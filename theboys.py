@@ -15,5 +15,8 @@ DRAFT_SETTINGS = {
     "TE": [1, 2],
 }
 
+# Starting lineup, 1 DEF aside
+LINEUP = {"QB": 1, "RB": 2, "WR": 3, "TE": 1, "FLEX": 2, "SF": 1}
+
 DRAFT_VALUE_FILE_GEN = "data/rankings-te-premium-superflex.csv"
 